@@ -0,0 +1,329 @@
+# app/auth.py
+"""
+FastAPI-Users wiring: user database adapter, user manager, JWT auth backend
+and the current_user/current_admin dependencies.
+"""
+import os
+import secrets
+import jwt
+from typing import Any, Dict, Optional
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import FastAPIUsers, BaseUserManager, IntegerIDMixin, exceptions
+from fastapi_users.authentication import CookieTransport, AuthenticationBackend, JWTStrategy
+from fastapi_users.db import SQLAlchemyUserDatabase
+from fastapi_users.jwt import generate_jwt
+from httpx_oauth.clients.google import GoogleOAuth2
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app import bootstrap  # noqa: F401  (loads .env)
+from app.database import get_db
+from app.models import User, OAuthAccount
+from app.schemas import UserCreate
+
+SECRET = os.getenv("SECRET_KEY") or "secret"
+SERVER_URL = os.getenv("SERVER_URL")
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
+
+class CustomSQLAlchemyUserDatabase(SQLAlchemyUserDatabase[User, int]):
+    async def add_oauth_account(
+        self, user: User, create_dict: Dict[str, Any], commit: bool = True
+    ) -> User:
+        """Link an OAuth account to the user. With commit=False the change is only
+        flushed, and the caller commits it together with its other writes."""
+        # Load oauth_accounts only if the caller hasn't already (avoids lazy loading)
+        if "oauth_accounts" in inspect(user).unloaded:
+            await self.session.refresh(user, attribute_names=["oauth_accounts"])
+
+        if self.oauth_account_table is None:
+            raise ValueError("No OAuth account table configured.")
+
+        oauth_account = self.oauth_account_table(**create_dict)
+        self.session.add(oauth_account)
+        user.oauth_accounts.append(oauth_account)
+        if commit:
+            await self.session.commit()
+        else:
+            await self.session.flush()
+        return user
+
+class CustomUserManager(IntegerIDMixin, BaseUserManager[User, int]):
+    reset_password_token_secret = SECRET
+    verification_token_secret = SECRET
+
+    async def create(self, user_create, safe: bool = False, request = None):
+        """Override create to ensure is_suspended is set"""
+        # Call parent create
+        user = await super().create(user_create, safe=safe, request=request)
+
+        # Explicitly ensure is_suspended is False if not already set
+        if not hasattr(user, 'is_suspended') or user.is_suspended is None:
+            await self.user_db.update(user, {"is_suspended": False})
+            await self.user_db.session.refresh(user)
+            print(f"Explicitly set is_suspended=False for user {user.email}")
+
+        return user
+
+    async def on_after_register(self, user: User, request: None = None):
+        print(f"User {user.email} (id={user.id}) has registered and is pending approval.")
+
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
+        """
+        Override authenticate to check if user is active (not pending)
+        """
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Run the hasher to mitigate timing attack
+            self.password_helper.hash(credentials.password)
+            return None
+
+        verified, updated_password_hash = self.password_helper.verify_and_update(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+
+        # Check if user is suspended (handle None as False)
+        is_suspended = getattr(user, 'is_suspended', None)
+        is_active = user.is_active
+
+        # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
+        if is_suspended is None or is_suspended is False or is_suspended == 0:
+            is_suspended = False
+        else:
+            is_suspended = True
+
+        if is_suspended:
+            raise HTTPException(
+                status_code=403,
+                detail="SUSPENDED"
+            )
+
+        # Check if user is pending approval
+        if not is_active:
+            raise HTTPException(
+                status_code=403,
+                detail="PENDING_APPROVAL"
+            )
+        
+        # Update password hash to a more robust one if needed
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
+
+    async def oauth_callback(
+        self,
+        oauth_name: str,
+        access_token: str,
+        account_id: str,
+        account_email: str,
+        expires_at: Optional[int] = None,
+        refresh_token: Optional[str] = None,
+        request: Optional[Request] = None,
+        *,
+        associate_by_email: bool = False,
+        is_verified_by_default: bool = False,
+    ) -> User:
+        print(f"OAuth callback START for {account_email}")
+        try:
+            oauth_account_dict = {
+                "oauth_name": oauth_name,
+                "access_token": access_token,
+                "account_id": account_id,
+                "account_email": account_email,
+                "expires_at": expires_at,
+                "refresh_token": refresh_token,
+            }
+
+            try:
+                user = await self.get_by_oauth_account(oauth_name, account_id)
+                print(f"Existing OAuth user found: {account_email}")
+                # User already has this OAuth account linked, just return them
+            except exceptions.UserNotExists:
+                user = None
+                print(f"No existing OAuth user for {account_email}")
+
+                # Try to find user by email and link OAuth account
+                if associate_by_email:
+                    try:
+                        user = await self.get_by_email(account_email)
+                        if user:
+                            # Eagerly load oauth_accounts to avoid lazy load in the check
+                            stmt = (
+                                select(User)
+                                .options(selectinload(User.oauth_accounts))
+                                .where(User.email == account_email)
+                            )
+                            result = await self.user_db.session.execute(stmt)
+                            user = result.scalars().one_or_none()
+
+                            # Check if user already has this OAuth account
+                            has_oauth = False
+                            for existing_oauth_account in user.oauth_accounts:
+                                if existing_oauth_account.oauth_name == oauth_name:
+                                    has_oauth = True
+                                    break
+
+                            # Only add OAuth account if not already linked
+                            if not has_oauth:
+                                user = await self.user_db.add_oauth_account(user, oauth_account_dict, commit=False)
+                                print(f"OAuth account linked to existing user {account_email}")
+                    except exceptions.UserNotExists:
+                        pass
+
+            if not user:
+                # Google OAuth users also require approval (is_active=False)
+                # Generate a random secure password (OAuth users won't use it)
+                random_password = secrets.token_urlsafe(32)
+                user_create = UserCreate(
+                    email=account_email,
+                    password=random_password,  # Random password for OAuth users (not used)
+                    is_verified=is_verified_by_default,
+                    is_active=False,  # Require approval for OAuth users
+                    is_suspended=False  # Explicitly set not suspended
+                )
+                user = await self.create(user_create)
+
+                # Refresh user from database to get all fields
+                await self.user_db.session.refresh(user)
+
+                # Debug: Check what was actually saved
+                print(f"OAuth user created: email={user.email}, is_active={user.is_active}, is_suspended={getattr(user, 'is_suspended', 'MISSING')}")
+
+                try:
+                    user = await self.user_db.add_oauth_account(user, oauth_account_dict, commit=False)
+                    print(f"OAuth account successfully linked for {user.email}")
+                except Exception as e:
+                    print(f"ERROR linking OAuth account for {user.email}: {e}")
+                    raise
+
+            # Note: We don't check for suspended/pending here because OAuth callback
+            # should always succeed and set the cookie. The checks happen when the user
+            # tries to access protected routes via the current_user dependency.
+            print(f"OAuth callback complete for {user.email}, is_active={user.is_active}, is_suspended={getattr(user, 'is_suspended', None)}")
+            return user
+        except Exception as e:
+            print(f"ERROR in OAuth callback for {account_email}: {type(e).__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+
+async def get_user_db(session: AsyncSession = Depends(get_db)):
+    yield CustomSQLAlchemyUserDatabase(session, User, oauth_account_table=OAuthAccount)
+
+async def get_user_manager(user_db: CustomSQLAlchemyUserDatabase = Depends(get_user_db)):
+    yield CustomUserManager(user_db)
+
+cookie_transport = CookieTransport(cookie_name="auth_cookie", cookie_max_age=3600)
+
+class ClaimsJWTStrategy(JWTStrategy):
+    """JWT strategy that also embeds the user's access flags in the token,
+    so require_superuser_from_claims can reject non-admin tokens without a user lookup.
+    The flags are not trusted on their own; the guard re-reads them from the users row."""
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "is_superuser": bool(user.is_superuser),
+            "is_active": bool(user.is_active),
+            "is_suspended": bool(getattr(user, 'is_suspended', False)),
+        }
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+# Decoder with its options bound once instead of merged on every jwt.decode() call
+_jwt = jwt.PyJWT(options={"verify_aud": False, "require": ["exp", "sub"]})
+
+def make_verifier(secret: str, algorithm: str = "HS256"):
+    """Return verify(token) -> payload with the key and algorithm bound in.
+    Raises jwt.PyJWTError on an invalid or expired token."""
+    key = secret.encode()
+    algorithms = [algorithm]
+    decode = _jwt.decode
+
+    def verify(token: str) -> dict:
+        return decode(token, key, algorithms=algorithms)
+
+    return verify
+
+verify_token = make_verifier(SECRET)
+
+def get_jwt_strategy() -> JWTStrategy:
+    return ClaimsJWTStrategy(secret=SECRET, lifetime_seconds=3600)
+
+auth_backend = AuthenticationBackend(
+    name="jwt",
+    transport=cookie_transport,
+    get_strategy=get_jwt_strategy,
+)
+
+google_oauth_client = GoogleOAuth2(GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET)
+
+fastapi_users = FastAPIUsers[User, int](
+    get_user_manager,
+    [auth_backend],
+)
+
+_base_current_user = fastapi_users.current_user(active=False)  # Don't check active here
+_base_current_admin = fastapi_users.current_user(active=False, superuser=True)  # Don't check active here
+
+# Custom dependency to check for suspended and pending users
+async def current_user(user: User = Depends(_base_current_user)) -> User:
+    """Check if user is suspended or pending before allowing access"""
+    # Check if user is suspended (handle None as False)
+    is_suspended = getattr(user, 'is_suspended', None)
+    is_active = user.is_active
+
+    # Debug logging
+    print(f"current_user check for {user.email}: is_suspended={is_suspended}, is_active={is_active}")
+
+    # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
+    if is_suspended is None or is_suspended is False or is_suspended == 0:
+        is_suspended = False
+    else:
+        is_suspended = True
+
+    if is_suspended:
+        print(f"User {user.email} is SUSPENDED - showing suspended page")
+        raise HTTPException(
+            status_code=403,
+            detail="SUSPENDED"
+        )
+    # Check if user is pending approval
+    if not is_active:
+        print(f"User {user.email} is PENDING - showing pending approval page")
+        raise HTTPException(
+            status_code=403,
+            detail="PENDING_APPROVAL"
+        )
+    return user
+
+async def current_admin(user: User = Depends(_base_current_admin)) -> User:
+    """Check if admin is suspended or pending before allowing access"""
+    # Check if user is suspended (handle None as False)
+    is_suspended = getattr(user, 'is_suspended', None)
+    is_active = user.is_active
+
+    # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
+    if is_suspended is None or is_suspended is False or is_suspended == 0:
+        is_suspended = False
+    else:
+        is_suspended = True
+
+    if is_suspended:
+        raise HTTPException(
+            status_code=403,
+            detail="SUSPENDED"
+        )
+    # Check if user is pending approval
+    if not is_active:
+        raise HTTPException(
+            status_code=403,
+            detail="PENDING_APPROVAL"
+        )
+    return user
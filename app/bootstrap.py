@@ -0,0 +1,19 @@
+# app/bootstrap.py
+"""
+Process-wide environment setup. Import this before reading any settings
+from os.environ; the .env file is parsed once per process.
+"""
+import os
+from dotenv import load_dotenv
+
+
+def load_env() -> None:
+    """Load .env into os.environ unless this process (or its parent) already did.
+    Set SKIP_DOTENV=1 to rely on the real environment only (e.g. containers, test runs)."""
+    if os.getenv("_ENV_LOADED") or os.getenv("SKIP_DOTENV") == "1":
+        return
+    load_dotenv()
+    os.environ["_ENV_LOADED"] = "1"
+
+
+load_env()
@@ -0,0 +1,83 @@
+# app/database.py
+"""
+Async database engine, session factory and the request-scoped session dependency.
+"""
+import asyncio
+import os
+from typing import Optional
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from starlette.requests import HTTPConnection
+
+from app import bootstrap  # noqa: F401  (loads .env)
+from app.models import Base
+
+
+def async_database_url(raw_url: Optional[str]) -> Optional[URL]:
+    """Parse a DATABASE_URL and switch MariaDB/MySQL URLs to the asyncmy driver (Cython protocol parser).
+    Only the driver part of the URL is changed; host, credentials and query are kept as-is."""
+    if not raw_url:
+        return None
+    url = make_url(raw_url)
+    backend = url.get_backend_name()
+    if backend in ("mariadb", "mysql") and url.get_driver_name() != "asyncmy":
+        url = url.set(drivername=f"{backend}+asyncmy")
+    return url
+
+DATABASE_URL = async_database_url(os.getenv("DATABASE_URL"))
+print("Using DATABASE_URL:", DATABASE_URL)  # Debug print (password is masked)
+
+# Pool sizing, tunable per deployment without a code change
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=1800,  # Recycle before MariaDB's wait_timeout drops idle connections
+    pool_pre_ping=True,
+    pool_use_lifo=True,  # Reuse the most recently returned (warm) connection first
+    connect_args={
+        "init_command": "SET time_zone='+00:00'",  # Force UTC for all sessions
+    }
+)
+
+async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+async def create_db_and_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def warmup_pool():
+    """Open DB_POOL_SIZE connections in parallel and return them to the pool,
+    so the first burst of requests doesn't pay the connect/auth handshake."""
+    async def open_connection():
+        return await engine.connect()
+
+    conns = await asyncio.gather(*(open_connection() for _ in range(DB_POOL_SIZE)), return_exceptions=True)
+    opened = [c for c in conns if not isinstance(c, BaseException)]
+    await asyncio.gather(*(c.close() for c in opened))
+    print(f"Connection pool warmed up ({len(opened)}/{DB_POOL_SIZE} connections).")
+
+class DBSessionMiddleware:
+    """
+    Open one AsyncSession per HTTP/WebSocket connection and expose it as
+    request.state.db. The session is closed (and any open transaction rolled
+    back) once the response has been sent.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or scope["path"].startswith("/static"):
+            await self.app(scope, receive, send)
+            return
+
+        async with async_session_maker() as session:
+            scope.setdefault("state", {})["db"] = session
+            await self.app(scope, receive, send)
+
+async def get_db(request: HTTPConnection) -> AsyncSession:
+    """Return the request-scoped session opened by DBSessionMiddleware."""
+    return request.state.db
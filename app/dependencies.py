@@ -2,73 +2,163 @@
 """
 Common dependency functions for FastAPI routes.
 """
+import hashlib
+import time
 from typing import Optional
+import jwt
 from fastapi import Depends, Header, HTTPException, Request
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth import current_user, verify_token
+from app.database import get_db
 from app.models import User
+from app.utils.user_cache import CachedUser, get_user_cached
 
+# Decoded JWT payloads keyed by a digest of the raw token, so repeated requests
+# carrying the same cookie skip the HMAC verify + base64 + JSON parse.
+# Format: {token_digest: (payload, exp, cached_at)}
+_TOKEN_CACHE_MAXSIZE = 4096
+_TOKEN_CACHE_TTL = 60  # seconds
+_token_cache: dict = {}
 
-def get_current_user_dependency():
-    """Import and return current_user dependency from main"""
-    from app.main import current_user
-    return current_user
 
+def _token_key(token: str) -> bytes:
+    """Fixed-size cache key for a raw token string."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
-def get_db_dependency():
-    """Import and return get_db dependency from main"""
-    from app.main import get_db
-    return get_db
+
+def _get_cached_payload(token: str) -> Optional[dict]:
+    """Return a previously verified payload if it is still fresh and unexpired."""
+    key = _token_key(token)
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+
+    payload, exp, cached_at = entry
+    if time.monotonic() - cached_at > _TOKEN_CACHE_TTL or exp <= time.time():
+        _token_cache.pop(key, None)
+        return None
+    return payload
+
+
+def _store_payload(token: str, payload: dict) -> None:
+    """Remember a verified payload; tokens without an expiry are never cached."""
+    exp = payload.get("exp")
+    if exp is None:
+        return
+
+    if len(_token_cache) >= _TOKEN_CACHE_MAXSIZE:
+        # Drop expired/stale entries first, then the oldest ones if still full
+        now_mono, now = time.monotonic(), time.time()
+        for key, (_, entry_exp, cached_at) in list(_token_cache.items()):
+            if now_mono - cached_at > _TOKEN_CACHE_TTL or entry_exp <= now:
+                del _token_cache[key]
+        while len(_token_cache) >= _TOKEN_CACHE_MAXSIZE:
+            del _token_cache[next(iter(_token_cache))]
+
+    _token_cache[_token_key(token)] = (payload, exp, time.monotonic())
+
+
+def decode_token_cached(token: str) -> dict:
+    """
+    Decode and verify a JWT, reusing the result for repeated tokens.
+
+    Raises jwt.PyJWTError on an invalid or expired token (cache misses only;
+    cached entries are dropped as soon as they expire).
+    """
+    payload = _get_cached_payload(token)
+    if payload is not None:
+        return payload
+
+    payload = verify_token(token)
+    _store_payload(token, payload)
+    return payload
+
+
+def _get_request_token(request: Request) -> Optional[str]:
+    """Auth token from the auth cookie, or from an 'Authorization: Bearer' header."""
+    token = request.cookies.get("auth_cookie")
+    if token:
+        return token
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer":
+        return token.strip() or None
+    return None
+
+
+async def _decode_and_load(token: str, session: AsyncSession) -> Optional[CachedUser]:
+    """Verify an auth token and load the (cached) user it belongs to."""
+    try:
+        payload = decode_token_cached(token)
+        user_id = int(payload["sub"])
+    except (jwt.PyJWTError, ValueError, KeyError):
+        return None
+    return await get_user_cached(session, user_id)
 
 
 async def get_optional_user(
     request: Request,
-    session: AsyncSession = Depends(get_db_dependency())
-) -> Optional[User]:
+    session: AsyncSession = Depends(get_db)
+) -> Optional[CachedUser]:
     """
     Get current user if authenticated, None otherwise.
     Used for endpoints that work with or without authentication (e.g., public discovery).
-    Checks both cookies and Authorization header.
+    Takes the token from the auth cookie, or the Authorization header if there is no cookie.
+    Returns a cached snapshot (id, email, flags), not a session-bound User.
     """
-    import jwt
-    from sqlalchemy import select
-
-    # Import here to avoid circular dependency
-    from app.main import SECRET
-
-    # Try to get auth from cookie first
-    cookie = request.cookies.get("auth_cookie")
-    if cookie:
-        try:
-            payload = jwt.decode(cookie, SECRET, algorithms=["HS256"], options={"verify_aud": False})
-            user_id = payload.get("sub")
-            if user_id:
-                result = await session.execute(select(User).where(User.id == int(user_id)))
-                user = result.scalars().first()
-                if user:
-                    return user
-        except:
-            pass
-
-    # Try Authorization header as fallback
-    auth_header = request.headers.get("authorization")
-    if auth_header:
-        try:
-            current_user_dep = get_current_user_dependency()
-            user = await current_user_dep(request)
-            return user
-        except:
-            pass
-
-    return None
+    token = _get_request_token(request)
+    if not token:
+        return None
+    return await _decode_and_load(token, session)
 
 
 async def require_superuser(
-    current_user: User = Depends(get_current_user_dependency())
+    user: User = Depends(current_user)
 ) -> User:
     """
     Dependency that ensures the current user is a superuser.
     Raises 403 if not a superuser.
     """
-    if not current_user.is_superuser:
+    if not user.is_superuser:
+        raise HTTPException(status_code=403, detail="Superuser access required")
+    return user
+
+
+async def require_superuser_from_claims(
+    request: Request,
+    session: AsyncSession = Depends(get_db)
+) -> int:
+    """
+    Superuser guard that uses the access flags embedded in the auth token.
+    A token without the superuser claim is rejected without a user lookup. Otherwise
+    the flags are read from the users row (one primary-key SELECT, bypassing the
+    per-worker user cache), so suspend/deactivate/demote apply on every worker at once.
+    Returns the user ID. Use require_superuser when the endpoint needs the User object.
+    """
+    token = _get_request_token(request)
+    if not token:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    try:
+        payload = decode_token_cached(token)
+        user_id = int(payload["sub"])
+    except (jwt.PyJWTError, KeyError, ValueError):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    # Promotions only show up in a new token; everything else is decided by the current user row
+    if not payload.get("is_superuser", True):
+        raise HTTPException(status_code=403, detail="Superuser access required")
+
+    result = await session.execute(
+        select(User.is_active, User.is_superuser, User.is_suspended).where(User.id == user_id)
+    )
+    flags = result.first()
+    if flags is None:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    if flags.is_suspended:
+        raise HTTPException(status_code=403, detail="SUSPENDED")
+    if not flags.is_active:
+        raise HTTPException(status_code=403, detail="PENDING_APPROVAL")
+    if not flags.is_superuser:
         raise HTTPException(status_code=403, detail="Superuser access required")
-    return current_user
+    return user_id
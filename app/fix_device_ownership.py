@@ -6,23 +6,30 @@ This script reassigns all devices to the admin user.
 Use this when devices exist in the database but aren't showing up for your user.
 
 Usage:
-    python fix_device_ownership.py
+    python -m app.fix_device_ownership
 """
 
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy import select, update, text
-from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
 import os
 
-load_dotenv()
+# Same driver and URL handling as the app (also loads .env)
+from app.database import async_database_url
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL:
-    DATABASE_URL = DATABASE_URL.replace("mariadb+mariadbconnector", "mariadb+aiomysql")
+DATABASE_URL = async_database_url(os.getenv("DATABASE_URL"))
 
 ADMIN_EMAIL = os.getenv("ADMIN_USERNAME")
 
+_engine = None
+
+def get_engine():
+    """One engine for the whole script run (shared by both commands)."""
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(DATABASE_URL)
+    return _engine
+
 async def fix_device_ownership():
     """Reassign all devices to the admin user."""
     print("\n" + "="*80)
@@ -41,12 +48,12 @@ async def fix_device_ownership():
     print("Connecting to database...")
     
     try:
-        engine = create_async_engine(DATABASE_URL)
-        async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-        
-        async with async_session_maker() as session:
+        async with get_engine().connect() as conn:
+            # Each statement commits on its own; there is only one write
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
             # Get admin user ID
-            result = await session.execute(
+            result = await conn.execute(
                 text("SELECT id FROM users WHERE email = :email"),
                 {"email": ADMIN_EMAIL}
             )
@@ -61,7 +68,7 @@ async def fix_device_ownership():
             print(f"✓ Found admin user (ID: {admin_id})")
             
             # Get all devices
-            result = await session.execute(
+            result = await conn.execute(
                 text("SELECT device_id, name, user_id FROM devices")
             )
             devices = result.fetchall()
@@ -99,17 +106,13 @@ async def fix_device_ownership():
             
             # Reassign devices
             print("\nReassigning devices...")
-            for device_id in devices_to_fix:
-                await session.execute(
-                    text("UPDATE devices SET user_id = :admin_id WHERE device_id = :device_id"),
-                    {"admin_id": admin_id, "device_id": device_id}
-                )
-                print(f"  ✓ Reassigned device: {device_id[:20]}...")
-            
-            await session.commit()
+            result = await conn.execute(
+                text("UPDATE devices SET user_id = :admin_id WHERE user_id IS NULL OR user_id != :admin_id"),
+                {"admin_id": admin_id}
+            )
             
             print("\n" + "="*80)
-            print(f"✓ SUCCESS! Reassigned {len(devices_to_fix)} device(s) to {ADMIN_EMAIL}")
+            print(f"✓ SUCCESS! Reassigned {result.rowcount} device(s) to {ADMIN_EMAIL}")
             print("="*80)
             print("\nNext steps:")
             print("  1. Refresh your browser")
@@ -119,8 +122,6 @@ async def fix_device_ownership():
             print("  5. Your dashboard should now show your devices!\n")
             
             return True
-            
-        await engine.dispose()
         
     except Exception as e:
         print(f"\n✗ ERROR: {e}\n")
@@ -133,11 +134,9 @@ async def list_all_users():
     print("="*80)
     
     try:
-        engine = create_async_engine(DATABASE_URL)
-        async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-        
-        async with async_session_maker() as session:
-            result = await session.execute(
+        async with get_engine().connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            result = await conn.execute(
                 text("SELECT id, email, is_superuser, is_active FROM users")
             )
             users = result.fetchall()
@@ -154,16 +153,21 @@ async def list_all_users():
                 status = "Active" if is_active else "Pending"
                 print(f"  ID: {user_id} | {email}{admin_badge} | {status}")
             print()
-            
-        await engine.dispose()
         
     except Exception as e:
         print(f"\n✗ ERROR: {e}\n")
 
+async def main(list_users: bool):
+    try:
+        if list_users:
+            await list_all_users()
+        else:
+            await fix_device_ownership()
+    finally:
+        if _engine is not None:
+            await _engine.dispose()
+
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--list-users":
-        asyncio.run(list_all_users())
-    else:
-        asyncio.run(fix_device_ownership())
+    asyncio.run(main(len(sys.argv) > 1 and sys.argv[1] == "--list-users"))
@@ -4,1151 +4,660 @@ This script ensures the database has all required tables and columns.
 It runs automatically on application startup and adds any missing schema elements.
 """
 
-from sqlalchemy import text, inspect
+from asyncmy.constants import CLIENT
+from contextlib import asynccontextmanager, contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 import asyncio
+import hashlib
+import logging
 import os
-from dotenv import load_dotenv
+import queue
+import re
+import sys
+
+from app import bootstrap  # noqa: F401  (loads .env)
+# Reuse the application's pooled engine rather than building a new one per run
+from app.database import DATABASE_URL, engine
+from app.models import Base
+
+# Separate unpooled engine for the batched CREATE script only, so the request
+# engine never accepts stacked statements. Passing client_flag replaces the
+# dialect's own flags, so FOUND_ROWS has to be kept explicitly.
+script_engine = create_async_engine(
+    DATABASE_URL,
+    poolclass=NullPool,
+    connect_args={
+        "init_command": "SET time_zone='+00:00'",
+        "client_flag": CLIENT.MULTI_STATEMENTS | CLIENT.FOUND_ROWS,
+    }
+)
+
+# Per-item "already exists" lines are debug output; set INIT_DB_VERBOSE=1 to see them.
+# Records propagate to the app's logging setup (see queued_root_logging).
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG if os.getenv("INIT_DB_VERBOSE") == "1" else logging.INFO)
+
+# Schema probes, built once and run with bound parameters
+_ALL_TABLES = text("""
+    SELECT TABLE_NAME
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE()
+""")
+_ALL_FOREIGN_KEYS = text("""
+    SELECT TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME
+    FROM information_schema.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND REFERENCED_TABLE_NAME IS NOT NULL
+""")
+_ALL_COLUMNS = text("""
+    SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+""")
+_TABLE_COLUMNS = text("""
+    SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = :table_name
+""")
+
+_REQUIRED_COLUMNS_PRESENT = text("""
+    SELECT TABLE_NAME, COLUMN_NAME
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME IN :table_names
+    AND COLUMN_NAME IN :column_names
+""").bindparams(bindparam("table_names", expanding=True), bindparam("column_names", expanding=True))
+
+_DATABASE_COLLATION = text(
+    "SELECT DEFAULT_COLLATION_NAME FROM information_schema.SCHEMATA WHERE SCHEMA_NAME = DATABASE()"
+)
+
+# Named lock held while init runs, so several worker processes don't run the DDL at once
+INIT_LOCK_NAME = "plants_logs_init"
+INIT_LOCK_WAIT = 60  # seconds per GET_LOCK attempt; waiting continues until the holder finishes
+_GET_INIT_LOCK = text("SELECT GET_LOCK(:name, :timeout)")
+_RELEASE_INIT_LOCK = text("SELECT RELEASE_LOCK(:name)")
+
+# Fixed statements used on every run
+_RELAX_CHECKS = text("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+_RESTORE_CHECKS = text("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+_CREATE_SCHEMA_META = text("""
+    CREATE TABLE IF NOT EXISTS _schema_meta (
+        meta_key VARCHAR(64) NOT NULL PRIMARY KEY,
+        meta_value VARCHAR(255) NOT NULL
+    ) ENGINE=InnoDB
+""")
+_GET_SCHEMA_VERSION = text("SELECT meta_value FROM _schema_meta WHERE meta_key = 'version'")
+_SET_SCHEMA_VERSION = text("""
+    INSERT INTO _schema_meta (meta_key, meta_value) VALUES ('version', :version)
+    ON DUPLICATE KEY UPDATE meta_value = VALUES(meta_value)
+""")
+# setting_key is UNIQUE; the no-op update keeps values an admin has already changed
+_SEED_ADMIN_SETTINGS = text("""
+    INSERT INTO admin_settings (setting_key, setting_value, description)
+    VALUES ('allow_anonymous_browsing', 'true', 'Allow non-logged-in users to browse published reports and grower profiles')
+    ON DUPLICATE KEY UPDATE setting_key = setting_key
+""")
+
+# Table/column names interpolated into DDL must be plain identifiers
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def quote_identifier(name: str) -> str:
+    """Backtick-quote a table or column name for DDL, rejecting anything that isn't a plain identifier."""
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return f"`{name}`"
+
+# Database-wide default, so tables from create_all and schema.sql all get the
+# same collation (mixed collations stop string joins using indexes)
+DB_CHARSET = "utf8mb4"
+DB_COLLATION = "utf8mb4_unicode_ci"
+
+class DatabaseCollationError(RuntimeError):
+    """The database default collation isn't DB_COLLATION and couldn't be changed."""
+
+# Bump for migrations that aren't captured by the DESIRED_* definitions below
+# (e.g. the notifications enum change, the database collation); edits to those are picked up by SCHEMA_FINGERPRINT
+SCHEMA_VERSION = 2
+
+# Tables created when missing, read from app/sql/schema.sql once at import
+_SCHEMA_SQL_PATH = Path(__file__).parent / "sql" / "schema.sql"
+_CREATE_TABLE_NAME = re.compile(r"CREATE TABLE IF NOT EXISTS\s+`?(\w+)`?", re.IGNORECASE)
+
+def _load_desired_tables(path: Path) -> tuple:
+    """Split schema.sql into (table_name, create_sql) pairs, in file order."""
+    tables = []
+    for statement in path.read_text(encoding="utf-8").split(";\n"):
+        create_sql = "\n".join(
+            line for line in statement.splitlines() if not line.lstrip().startswith("--")
+        ).strip()
+        if not create_sql:
+            continue
+        match = _CREATE_TABLE_NAME.match(create_sql)
+        if not match:
+            raise ValueError(f"{path.name}: expected CREATE TABLE IF NOT EXISTS, got {create_sql[:60]!r}")
+        tables.append((match.group(1), create_sql))
+    return tuple(tables)
+
+DESIRED_TABLES = _load_desired_tables(_SCHEMA_SQL_PATH)
+
+# Columns added to older databases: (table, column, column definition)
+DESIRED_COLUMNS = (
+    ('users', 'first_name', "first_name VARCHAR(255) NULL AFTER email"),
+    ('users', 'last_name', "last_name VARCHAR(255) NULL AFTER first_name"),
+    ('users', 'is_suspended', "is_suspended BOOLEAN NOT NULL DEFAULT FALSE AFTER is_verified"),
+    ('users', 'dashboard_preferences', "dashboard_preferences TEXT NULL AFTER is_suspended"),
+    ('users', 'created_at', "created_at DATETIME NULL AFTER dashboard_preferences"),
+    ('users', 'last_login', "last_login DATETIME NULL AFTER created_at"),
+    ('users', 'login_count', "login_count INT NOT NULL DEFAULT 0 AFTER last_login"),
+    ('devices', 'scope', "scope VARCHAR(20) NULL DEFAULT 'plant' AFTER device_type"),  # plant-level vs room-level
+    ('devices', 'capabilities', "capabilities TEXT NULL AFTER scope"),  # JSON field for device capabilities
+    ('devices', 'settings', "settings TEXT NULL AFTER capabilities"),  # JSON field for device-specific settings
+    ('devices', 'last_seen', "last_seen DATETIME NULL AFTER is_online"),  # better online/offline tracking
+    ('devices', 'firmware_version', "firmware_version VARCHAR(50) NULL AFTER scope"),  # device's reported firmware version
+    ('devices', 'mdns_hostname', "mdns_hostname VARCHAR(255) NULL AFTER firmware_version"),  # mDNS hostname for local network discovery
+    ('devices', 'ip_address', "ip_address VARCHAR(45) NULL AFTER mdns_hostname"),  # current IP address
+    ('plants', 'batch_number', "batch_number VARCHAR(100) NULL AFTER name"),
+    ('plants', 'display_order', "display_order INT NULL DEFAULT 0 AFTER yield_grams"),
+    ('plants', 'status', "status VARCHAR(50) NOT NULL DEFAULT 'created' AFTER display_order"),
+    ('plants', 'current_phase', "current_phase VARCHAR(50) NULL AFTER status"),
+    ('plants', 'harvest_date', "harvest_date DATETIME NULL AFTER current_phase"),
+    ('plants', 'cure_start_date', "cure_start_date DATETIME NULL AFTER harvest_date"),
+    ('plants', 'cure_end_date', "cure_end_date DATETIME NULL AFTER cure_start_date"),
+    ('plants', 'expected_seed_days', "expected_seed_days INT NULL AFTER cure_end_date"),
+    ('plants', 'expected_clone_days', "expected_clone_days INT NULL AFTER expected_seed_days"),
+    ('plants', 'expected_veg_days', "expected_veg_days INT NULL AFTER expected_clone_days"),
+    ('plants', 'expected_flower_days', "expected_flower_days INT NULL AFTER expected_veg_days"),
+    ('plants', 'expected_drying_days', "expected_drying_days INT NULL AFTER expected_flower_days"),
+    ('plants', 'expected_curing_days', "expected_curing_days INT NULL AFTER expected_drying_days"),
+    ('plants', 'template_id', "template_id INT NULL AFTER expected_curing_days"),
+    ('plants', 'show_on_profile', "show_on_profile BOOLEAN NOT NULL DEFAULT FALSE AFTER template_id"),  # public visibility toggles
+    ('plants', 'show_as_upcoming', "show_as_upcoming BOOLEAN NOT NULL DEFAULT FALSE AFTER show_on_profile"),
+    ('devices', 'location_id', "location_id INT NULL AFTER user_id"),  # location assignment
+    ('plants', 'location_id', "location_id INT NULL AFTER user_id"),
+    ('device_links', 'removed_at', "removed_at DATETIME NULL AFTER created_at"),
+    # Also in the plant_daily_logs CREATE; listed for tables created before the light columns existed.
+    # These resolve against the snapshot, so they cost no queries when the columns are present.
+    ('plant_daily_logs', 'total_light_seconds', "total_light_seconds INT NULL AFTER vpd_avg"),
+    ('plant_daily_logs', 'light_cycles_count', "light_cycles_count INT NULL AFTER total_light_seconds"),
+    ('plant_daily_logs', 'longest_light_period_seconds', "longest_light_period_seconds INT NULL AFTER light_cycles_count"),
+    ('plant_daily_logs', 'shortest_light_period_seconds', "shortest_light_period_seconds INT NULL AFTER longest_light_period_seconds"),
+    ('published_reports', 'show_on_profile', "show_on_profile BOOLEAN NOT NULL DEFAULT TRUE AFTER grower_notes"),
+)
+
+# Column defaults: (table, column, default). is_active defaults to FALSE so new users start pending approval
+DESIRED_DEFAULTS = (
+    ('users', 'is_active', '0'),
+)
+
+# Foreign keys: (table, column, referenced table, constraint definition)
+DESIRED_FOREIGN_KEYS = (
+    ('devices', 'location_id', 'locations',
+     "CONSTRAINT fk_devices_location FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE SET NULL"),
+    ('plants', 'location_id', 'locations',
+     "CONSTRAINT fk_plants_location FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE SET NULL"),
+)
+
+# Columns verify_database_schema() reports on: (table, column)
+REQUIRED_COLUMNS = (
+    ('users', 'id'),
+    ('users', 'email'),
+    ('users', 'hashed_password'),
+    ('users', 'first_name'),
+    ('users', 'last_name'),
+    ('users', 'is_active'),
+    ('users', 'is_superuser'),
+    ('users', 'is_verified'),
+)
+
+# Old device-centric logging tables, replaced by plant_daily_logs
+LEGACY_TABLES = ('log_entries', 'environment_logs')
+
+# Stored in _schema_meta after a clean run. Any change to the definitions above
+# (or a SCHEMA_VERSION bump) changes it, so existing databases run the checks again.
+SCHEMA_FINGERPRINT = f"{SCHEMA_VERSION}:" + hashlib.sha256(repr((
+    DESIRED_TABLES, DESIRED_COLUMNS, DESIRED_DEFAULTS, DESIRED_FOREIGN_KEYS, LEGACY_TABLES,
+)).encode()).hexdigest()[:16]
+
+# Set once init_database() has succeeded in this process (see ensure_initialized)
+_init_done = asyncio.Event()
+_init_lock = asyncio.Lock()
+
+class SchemaSnapshot:
+    """In-memory copy of the current schema, so the checks below don't each query information_schema."""
+
+    def __init__(self):
+        self.tables = set()
+        self.columns = {}  # {table_name: {column_name: (column_type, is_nullable, column_default)}}
+        self.foreign_keys = set()  # {(table_name, column_name, referenced_table_name)}
+        self.failed = []  # Descriptions of steps that raised; the version is only stamped when empty
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return column_name in self.columns.get(table_name, {})
+
+def _add_column_rows(schema: SchemaSnapshot, rows):
+    for table, column, column_type, is_nullable, column_default in rows:
+        schema.columns.setdefault(table, {})[column] = (column_type, is_nullable, column_default)
+
+async def load_table_columns(connection, schema: SchemaSnapshot, table_name: str):
+    """Load column info for one (newly created) table into the snapshot."""
+    result = await connection.execute(_TABLE_COLUMNS, {"table_name": table_name})
+    _add_column_rows(schema, result.fetchall())
+
+async def _fetch_all(statement):
+    async with engine.connect() as connection:
+        result = await connection.execute(statement)
+        return result.fetchall()
+
+async def load_schema_snapshot() -> SchemaSnapshot:
+    """Read all tables, columns and foreign keys of the current database.
+    The three queries are independent, so each runs on its own pooled connection."""
+    tables, columns, foreign_keys = await asyncio.gather(
+        _fetch_all(_ALL_TABLES),
+        _fetch_all(_ALL_COLUMNS),
+        _fetch_all(_ALL_FOREIGN_KEYS),
+    )
+
+    schema = SchemaSnapshot()
+    schema.tables = {row[0] for row in tables}
+    _add_column_rows(schema, columns)
+    schema.foreign_keys = {tuple(row) for row in foreign_keys}
+    return schema
+
+def check_and_add_column(alters: dict, schema: SchemaSnapshot, table_name: str, column_name: str, column_definition: str):
+    """Queue an ADD COLUMN if the schema snapshot doesn't have the column.
+    The clause itself is IF NOT EXISTS, so a stale snapshot can't make it fail."""
+    name, _, column_spec = column_definition.partition(" ")
+    if name != column_name:
+        raise ValueError(f"Definition for {table_name}.{column_name} starts with {name!r}")
+    if not schema.has_column(table_name, column_name):
+        alters.setdefault(table_name, []).append((
+            f"column '{column_name}'",
+            f"ADD COLUMN IF NOT EXISTS {quote_identifier(column_name)} {column_spec}",
+        ))
+        schema.columns.setdefault(table_name, {})[column_name] = (None, None, None)
+        return True
+    logger.debug(f"  ✓ Column '{column_name}' already exists in '{table_name}'")
+    return False
+
+def check_and_modify_column_default(alters: dict, schema: SchemaSnapshot, table_name: str, column_name: str, new_default):
+    """Queue a MODIFY COLUMN if the column's default differs from new_default."""
+    # For MariaDB/MySQL, we need to know the full column definition to modify it
+    column_info = schema.columns.get(table_name, {}).get(column_name)
+    if not column_info:
+        logger.error(f"  ✗ Column '{column_name}' not found in '{table_name}'")
+        return False
 
-load_dotenv()
+    column_type, nullable, current_default = column_info
+    if str(current_default) == str(new_default):
+        logger.debug(f"  ✓ Default value for '{column_name}' is already {new_default}")
+        return False
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL:
-    DATABASE_URL = DATABASE_URL.replace("mariadb+mariadbconnector", "mariadb+aiomysql")
+    is_nullable = 'NULL' if nullable == 'YES' else 'NOT NULL'
+    alters.setdefault(table_name, []).append((
+        f"default of '{column_name}' ({new_default})",
+        f"MODIFY COLUMN {quote_identifier(column_name)} {column_type} {is_nullable} DEFAULT {new_default}",
+    ))
+    schema.columns[table_name][column_name] = (column_type, nullable, str(new_default))
+    return True
+
+def check_and_add_foreign_key(alters: dict, schema: SchemaSnapshot, table_name: str, column_name: str,
+                              referenced_table: str, constraint_sql: str):
+    """Queue an ADD CONSTRAINT if no foreign key from table.column to referenced_table exists."""
+    if (table_name, column_name, referenced_table) in schema.foreign_keys:
+        logger.debug(f"  ✓ Foreign key constraint for {table_name}.{column_name} already exists")
+        return False
+    alters.setdefault(table_name, []).append((f"foreign key on '{column_name}'", f"ADD {constraint_sql}"))
+    schema.foreign_keys.add((table_name, column_name, referenced_table))
+    return True
 
-async def check_and_add_column(connection, table_name: str, column_name: str, column_definition: str):
-    """Check if a column exists, and add it if it doesn't."""
+async def _alter_table(schema: SchemaSnapshot, table_name: str, changes: list):
+    descriptions = ", ".join(description for description, _ in changes)
+    logger.info(f"  Altering '{table_name}': {descriptions}...")
+    try:
+        clauses = ",\n    ".join(clause for _, clause in changes)
+        async with engine.begin() as connection, relaxed_checks(connection):
+            await connection.execute(text(f"ALTER TABLE {quote_identifier(table_name)}\n    {clauses}"))
+        logger.info(f"  ✓ '{table_name}' updated ({len(changes)} change(s))")
+    except Exception as e:
+        logger.error(f"  ✗ Error altering table '{table_name}': {e}")
+        schema.failed.append(f"alter {table_name}")
+
+async def apply_pending_alters(schema: SchemaSnapshot, alters: dict):
+    """Run the queued changes as one ALTER TABLE per table (one table rebuild instead of one per change).
+    The tables are independent, so each ALTER runs on its own pooled connection and they rebuild concurrently."""
+    await asyncio.gather(*(
+        _alter_table(schema, table_name, changes) for table_name, changes in alters.items()
+    ))
+
+async def check_and_create_table(connection, schema: SchemaSnapshot, table_name: str, create_sql: str):
+    """Create a table if the schema snapshot doesn't have it (create_sql uses IF NOT EXISTS as well)."""
     try:
-        # Check if column exists
-        result = await connection.execute(text(f"""
-            SELECT COUNT(*) as count
-            FROM information_schema.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-            AND TABLE_NAME = '{table_name}'
-            AND COLUMN_NAME = '{column_name}'
-        """))
-        row = result.fetchone()
-
-        if row[0] == 0:
-            # Column doesn't exist, add it
-            print(f"  Adding column '{column_name}' to table '{table_name}'...")
-            await connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_definition}"))
+        if table_name not in schema.tables:
+            # Table doesn't exist, create it
+            logger.info(f"  Creating table '{table_name}'...")
+            await connection.execute(text(create_sql))
             # Don't commit here - let the context manager handle it
-            print(f"  ✓ Column '{column_name}' added successfully")
+            schema.tables.add(table_name)
+            await load_table_columns(connection, schema, table_name)
+            logger.info(f"  ✓ Table '{table_name}' created successfully")
             return True
         else:
-            print(f"  ✓ Column '{column_name}' already exists in '{table_name}'")
+            logger.debug(f"  ✓ Table '{table_name}' already exists")
             return False
     except Exception as e:
-        print(f"  ✗ Error checking/adding column '{column_name}': {e}")
+        logger.error(f"  ✗ Error checking/creating table '{table_name}': {e}")
+        schema.failed.append(f"create {table_name}")
         return False
 
-async def check_and_modify_column_default(connection, table_name: str, column_name: str, new_default):
-    """Modify the default value of a column."""
-    try:
-        print(f"  Updating default value for '{column_name}' in '{table_name}'...")
-
-        # For MariaDB/MySQL, we need to know the full column definition to modify it
-        # Get current column definition
-        result = await connection.execute(text(f"""
-            SELECT COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-            FROM information_schema.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-            AND TABLE_NAME = '{table_name}'
-            AND COLUMN_NAME = '{column_name}'
-        """))
-        row = result.fetchone()
-
-        if row:
-            column_type = row[0]
-            is_nullable = 'NULL' if row[1] == 'YES' else 'NOT NULL'
-            current_default = row[2]
-
-            # Check if default needs to be changed
-            if str(current_default) != str(new_default):
-                # Modify column with new default
-                await connection.execute(text(f"""
-                    ALTER TABLE {table_name}
-                    MODIFY COLUMN {column_name} {column_type} {is_nullable} DEFAULT {new_default}
-                """))
-                # Don't commit here - let the context manager handle it
-                print(f"  ✓ Default value for '{column_name}' updated to {new_default}")
-                return True
-            else:
-                print(f"  ✓ Default value for '{column_name}' is already {new_default}")
-                return False
+async def create_missing_tables(connection, schema: SchemaSnapshot):
+    """Create every desired table the snapshot doesn't have, sent as one multi-statement script
+    on a script_engine connection (the only one with CLIENT.MULTI_STATEMENTS);
+    if the script fails, fall back to one CREATE per table on the given connection;
+    every CREATE uses IF NOT EXISTS, so re-running the ones that did succeed is harmless."""
+    missing = []
+    for table_name, create_sql in DESIRED_TABLES:
+        if table_name in schema.tables:
+            logger.debug(f"  ✓ Table '{table_name}' already exists")
         else:
-            print(f"  ✗ Column '{column_name}' not found in '{table_name}'")
-            return False
+            missing.append((table_name, create_sql))
+    if not missing:
+        return
 
+    names = ", ".join(name for name, _ in missing)
+    logger.info(f"  Creating tables: {names}...")
+    try:
+        script = ";\n".join(sql.strip() for _, sql in missing)
+        async with script_engine.connect() as script_conn, relaxed_checks(script_conn):
+            raw = await script_conn.get_raw_connection()
+            async with raw.driver_connection.cursor() as cursor:
+                await cursor.execute(script)
+                # Read the remaining results so an error in a later statement surfaces here
+                while await cursor.nextset():
+                    pass
     except Exception as e:
-        print(f"  ✗ Error modifying column default: {e}")
-        return False
-
-async def check_and_create_table(connection, table_name: str, create_sql: str):
-    """Check if a table exists, and create it if it doesn't."""
+        logger.warning(f"  Note: Batched CREATE failed ({e}), creating tables one at a time")
+        for table_name, create_sql in missing:
+            await check_and_create_table(connection, schema, table_name, create_sql)
+        return
+
+    # Pick up the new tables' columns in one query for the column checks that follow
+    result = await connection.execute(_ALL_COLUMNS)
+    _add_column_rows(schema, result.fetchall())
+    schema.tables.update(name for name, _ in missing)
+    logger.info(f"  ✓ Created {len(missing)} table(s)")
+
+@asynccontextmanager
+async def relaxed_checks(connection):
+    """Turn off foreign key and unique checks on this connection for the duration of the block."""
+    await connection.execute(_RELAX_CHECKS)
     try:
-        # Check if table exists
-        result = await connection.execute(text(f"""
-            SELECT COUNT(*) as count
-            FROM information_schema.TABLES
-            WHERE TABLE_SCHEMA = DATABASE()
-            AND TABLE_NAME = '{table_name}'
-        """))
-        row = result.fetchone()
-
-        if row[0] == 0:
-            # Table doesn't exist, create it
-            print(f"  Creating table '{table_name}'...")
-            await connection.execute(text(create_sql))
-            # Don't commit here - let the context manager handle it
-            print(f"  ✓ Table '{table_name}' created successfully")
-            return True
-        else:
-            print(f"  ✓ Table '{table_name}' already exists")
-            return False
+        yield
+    finally:
+        # The connection goes back to the pool afterwards, so always restore the defaults
+        await connection.execute(_RESTORE_CHECKS)
+
+async def ensure_database_collation(connection):
+    """Set the database default charset/collation before any table is created.
+    New tables inherit it (schema.sql has no per-table charset), so a mismatch
+    raises DatabaseCollationError instead of creating tables with the server default."""
+    result = await connection.execute(_DATABASE_COLLATION)
+    if result.scalar() == DB_COLLATION:
+        logger.debug(f"  ✓ Database default collation is already {DB_COLLATION}")
+        return
+    try:
+        await connection.execute(text(f"ALTER DATABASE CHARACTER SET {DB_CHARSET} COLLATE {DB_COLLATION}"))
     except Exception as e:
-        print(f"  ✗ Error checking/creating table '{table_name}': {e}")
-        return False
+        raise DatabaseCollationError(f"Could not set the database default collation to {DB_COLLATION}: {e}") from e
+    result = await connection.execute(_DATABASE_COLLATION)
+    current = result.scalar()
+    if current != DB_COLLATION:
+        raise DatabaseCollationError(f"Database default collation is {current}, expected {DB_COLLATION}")
+    logger.info(f"  ✓ Database default collation set to {DB_COLLATION}")
+
+async def get_schema_version(connection):
+    """Return the schema version stamped by the last successful run, or None."""
+    await connection.execute(_CREATE_SCHEMA_META)
+    result = await connection.execute(_GET_SCHEMA_VERSION)
+    row = result.fetchone()
+    return row[0] if row else None
+
+async def set_schema_version(connection, version: str):
+    """Record that the checks for this schema version completed without errors."""
+    await connection.execute(_SET_SCHEMA_VERSION, {"version": version})
+
+@contextmanager
+def queued_root_logging():
+    """
+    While init runs, put a QueueHandler on the root logger and let a QueueListener
+    thread write the records with the root's own handlers, so the DDL isn't held up
+    by console writes. The app's handlers, levels and formatting are restored afterwards;
+    if no logging is configured, output goes to stdout as the old print() calls did.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *(handlers or [logging.StreamHandler(sys.stdout)]),
+                             respect_handler_level=True)
+    queue_handler = QueueHandler(log_queue)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    listener.start()
+    try:
+        yield
+    finally:
+        root.removeHandler(queue_handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        # Flushes whatever is still queued
+        listener.stop()
 
 async def init_database():
     """Initialize database schema with all required tables and columns."""
-    print("\n" + "="*80)
-    print("DATABASE INITIALIZATION")
-    print("="*80)
+    with queued_root_logging():
+        return await _init_database()
+
+async def _init_database():
+    logger.info("\n" + "="*80)
+    logger.info("DATABASE INITIALIZATION")
+    logger.info("="*80)
     
     if not DATABASE_URL:
-        print("✗ DATABASE_URL not found in environment variables")
+        logger.error("✗ DATABASE_URL not found in environment variables")
         return False
+
+    if os.getenv("SKIP_DB_INIT") == "1":
+        logger.info("SKIP_DB_INIT=1 - skipping schema checks")
+        return True
     
-    print(f"Connecting to database...")
-    engine = create_async_engine(DATABASE_URL)
+    logger.info("Connecting to database...")
     
     try:
         async with engine.begin() as conn:
-            print("✓ Connected to database successfully\n")
-            
-            # Check and create tables if they don't exist
-            # Note: FastAPI-Users will create the basic tables, but we need to ensure columns exist
-            
-            print("Checking 'users' table schema...")
-            
-            # Add first_name column if it doesn't exist
-            await check_and_add_column(
-                conn, 
-                'users', 
-                'first_name', 
-                "first_name VARCHAR(255) NULL AFTER email"
-            )
-            
-            # Add last_name column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'users',
-                'last_name',
-                "last_name VARCHAR(255) NULL AFTER first_name"
-            )
-
-            # Add is_suspended column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'users',
-                'is_suspended',
-                "is_suspended BOOLEAN NOT NULL DEFAULT FALSE AFTER is_verified"
-            )
-
-            # Add dashboard_preferences column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'users',
-                'dashboard_preferences',
-                "dashboard_preferences TEXT NULL AFTER is_suspended"
-            )
-
-            # Add created_at column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'users',
-                'created_at',
-                "created_at DATETIME NULL AFTER dashboard_preferences"
-            )
-
-            # Add last_login column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'users',
-                'last_login',
-                "last_login DATETIME NULL AFTER created_at"
-            )
-
-            # Add login_count column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'users',
-                'login_count',
-                "login_count INT NOT NULL DEFAULT 0 AFTER last_login"
-            )
-
-            # Update is_active default to FALSE for new users (pending approval)
-            # Note: This won't affect existing users, only new ones
-            await check_and_modify_column_default(
-                conn,
-                'users',
-                'is_active',
-                '0'  # FALSE in MySQL/MariaDB
-            )
-
-            print("\nChecking 'devices' table schema...")
-
-            # Add scope column if it doesn't exist (plant-level vs room-level)
-            await check_and_add_column(
-                conn,
-                'devices',
-                'scope',
-                "scope VARCHAR(20) NULL DEFAULT 'plant' AFTER device_type"
-            )
-
-            # Add capabilities column if it doesn't exist (JSON field for device capabilities)
-            await check_and_add_column(
-                conn,
-                'devices',
-                'capabilities',
-                "capabilities TEXT NULL AFTER scope"
-            )
-
-            # Add settings column if it doesn't exist (JSON field for device-specific settings)
-            await check_and_add_column(
-                conn,
-                'devices',
-                'settings',
-                "settings TEXT NULL AFTER capabilities"
-            )
-
-            # Add last_seen column if it doesn't exist (better online/offline tracking)
-            await check_and_add_column(
-                conn,
-                'devices',
-                'last_seen',
-                "last_seen DATETIME NULL AFTER is_online"
-            )
-
-            # Add firmware_version column if it doesn't exist (device's reported firmware version)
-            await check_and_add_column(
-                conn,
-                'devices',
-                'firmware_version',
-                "firmware_version VARCHAR(50) NULL AFTER scope"
-            )
-
-            # Add mdns_hostname column if it doesn't exist (mDNS hostname for local network discovery)
-            await check_and_add_column(
-                conn,
-                'devices',
-                'mdns_hostname',
-                "mdns_hostname VARCHAR(255) NULL AFTER firmware_version"
-            )
-
-            # Add ip_address column if it doesn't exist (current IP address)
-            await check_and_add_column(
-                conn,
-                'devices',
-                'ip_address',
-                "ip_address VARCHAR(45) NULL AFTER mdns_hostname"
-            )
-
-            print("\nChecking 'plants' table schema...")
-
-            # Add batch_number column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'batch_number',
-                "batch_number VARCHAR(100) NULL AFTER name"
-            )
-
-            # Add display_order column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'display_order',
-                "display_order INT NULL DEFAULT 0 AFTER yield_grams"
-            )
-
-            # Add status column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'status',
-                "status VARCHAR(50) NOT NULL DEFAULT 'created' AFTER display_order"
-            )
-
-            # Add current_phase column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'current_phase',
-                "current_phase VARCHAR(50) NULL AFTER status"
-            )
-
-            # Add harvest_date column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'harvest_date',
-                "harvest_date DATETIME NULL AFTER current_phase"
-            )
-
-            # Add cure_start_date column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'cure_start_date',
-                "cure_start_date DATETIME NULL AFTER harvest_date"
-            )
-
-            # Add cure_end_date column if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'cure_end_date',
-                "cure_end_date DATETIME NULL AFTER cure_start_date"
-            )
-
-            # Add expected phase duration columns if they don't exist
-            await check_and_add_column(
-                conn,
-                'plants',
-                'expected_seed_days',
-                "expected_seed_days INT NULL AFTER cure_end_date"
-            )
-
-            await check_and_add_column(
-                conn,
-                'plants',
-                'expected_clone_days',
-                "expected_clone_days INT NULL AFTER expected_seed_days"
-            )
-
-            await check_and_add_column(
-                conn,
-                'plants',
-                'expected_veg_days',
-                "expected_veg_days INT NULL AFTER expected_clone_days"
-            )
-
-            await check_and_add_column(
-                conn,
-                'plants',
-                'expected_flower_days',
-                "expected_flower_days INT NULL AFTER expected_veg_days"
-            )
-
-            await check_and_add_column(
-                conn,
-                'plants',
-                'expected_drying_days',
-                "expected_drying_days INT NULL AFTER expected_flower_days"
-            )
-
-            await check_and_add_column(
-                conn,
-                'plants',
-                'expected_curing_days',
-                "expected_curing_days INT NULL AFTER expected_drying_days"
-            )
-
-            await check_and_add_column(
-                conn,
-                'plants',
-                'template_id',
-                "template_id INT NULL AFTER expected_curing_days"
-            )
-
-            # Add public visibility toggles
-            await check_and_add_column(
-                conn,
-                'plants',
-                'show_on_profile',
-                "show_on_profile BOOLEAN NOT NULL DEFAULT FALSE AFTER template_id"
-            )
-
-            await check_and_add_column(
-                conn,
-                'plants',
-                'show_as_upcoming',
-                "show_as_upcoming BOOLEAN NOT NULL DEFAULT FALSE AFTER show_on_profile"
-            )
-
-            print("\nChecking 'device_shares' table...")
-
-            # Create device_shares table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'device_shares',
-                """
-                CREATE TABLE device_shares (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    device_id INT NOT NULL,
-                    owner_user_id INT NOT NULL,
-                    shared_with_user_id INT NULL,
-                    share_code VARCHAR(12) NOT NULL UNIQUE,
-                    permission_level VARCHAR(20) NOT NULL,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    expires_at DATETIME NOT NULL,
-                    accepted_at DATETIME NULL,
-                    revoked_at DATETIME NULL,
-                    is_active BOOLEAN NOT NULL DEFAULT TRUE,
-                    INDEX idx_device_id (device_id),
-                    INDEX idx_share_code (share_code),
-                    INDEX idx_owner_user_id (owner_user_id),
-                    INDEX idx_shared_with_user_id (shared_with_user_id),
-                    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE,
-                    FOREIGN KEY (owner_user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY (shared_with_user_id) REFERENCES users(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
-
-            print("\nChecking 'device_connections' table...")
-
-            # Create device_connections table for tracking device-to-device relationships
-            await check_and_create_table(
-                conn,
-                'device_connections',
-                """
-                CREATE TABLE device_connections (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    source_device_id INT NOT NULL COMMENT 'Device initiating the connection',
-                    target_device_id INT NOT NULL COMMENT 'Device being connected to',
-                    connection_type VARCHAR(50) NOT NULL COMMENT 'valve_control, power_monitoring, etc',
-                    config JSON NULL COMMENT 'Connection-specific configuration (valve IDs, etc)',
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    removed_at DATETIME NULL COMMENT 'Soft delete timestamp',
-                    INDEX idx_source_device (source_device_id),
-                    INDEX idx_target_device (target_device_id),
-                    INDEX idx_connection_type (connection_type),
-                    INDEX idx_active (source_device_id, removed_at),
-                    FOREIGN KEY (source_device_id) REFERENCES devices(id) ON DELETE CASCADE,
-                    FOREIGN KEY (target_device_id) REFERENCES devices(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
-
-            print("\nChecking 'locations' table...")
-
-            # Create locations table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'locations',
-                """
-                CREATE TABLE locations (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    description TEXT NULL,
-                    parent_id INT NULL,
-                    user_id INT NOT NULL,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_parent_id (parent_id),
-                    INDEX idx_user_id (user_id),
-                    FOREIGN KEY (parent_id) REFERENCES locations(id) ON DELETE CASCADE,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
-
-            print("\nChecking 'location_shares' table...")
-
-            # Create location_shares table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'location_shares',
-                """
-                CREATE TABLE location_shares (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    location_id INT NOT NULL,
-                    owner_user_id INT NOT NULL,
-                    shared_with_user_id INT NULL,
-                    share_code VARCHAR(12) NOT NULL UNIQUE,
-                    permission_level VARCHAR(20) NOT NULL,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    expires_at DATETIME NOT NULL,
-                    accepted_at DATETIME NULL,
-                    revoked_at DATETIME NULL,
-                    is_active BOOLEAN NOT NULL DEFAULT TRUE,
-                    INDEX idx_location_id (location_id),
-                    INDEX idx_share_code (share_code),
-                    INDEX idx_owner_user_id (owner_user_id),
-                    INDEX idx_shared_with_user_id (shared_with_user_id),
-                    FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE CASCADE,
-                    FOREIGN KEY (owner_user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY (shared_with_user_id) REFERENCES users(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
-
-            print("\nAdding location_id column to devices and plants tables...")
-
-            # Add location_id to devices table
-            await check_and_add_column(
-                conn,
-                'devices',
-                'location_id',
-                "location_id INT NULL AFTER user_id"
-            )
-
-            # Add foreign key for devices.location_id if it doesn't exist
-            try:
-                # Check if foreign key exists
-                result = await conn.execute(text("""
-                    SELECT COUNT(*) as count
-                    FROM information_schema.KEY_COLUMN_USAGE
-                    WHERE TABLE_SCHEMA = DATABASE()
-                    AND TABLE_NAME = 'devices'
-                    AND COLUMN_NAME = 'location_id'
-                    AND REFERENCED_TABLE_NAME = 'locations'
-                """))
-                row = result.fetchone()
-
-                if row[0] == 0:
-                    print("  Adding foreign key constraint for devices.location_id...")
-                    await conn.execute(text("""
-                        ALTER TABLE devices
-                        ADD CONSTRAINT fk_devices_location
-                        FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE SET NULL
-                    """))
-                    print("  ✓ Foreign key constraint added")
-                else:
-                    print("  ✓ Foreign key constraint already exists")
-            except Exception as e:
-                print(f"  Note: Foreign key constraint may already exist or error occurred: {e}")
-
-            # Add location_id to plants table
-            await check_and_add_column(
-                conn,
-                'plants',
-                'location_id',
-                "location_id INT NULL AFTER user_id"
-            )
+            logger.info("✓ Connected to database successfully\n")
 
-            # Add foreign key for plants.location_id if it doesn't exist
-            try:
-                # Check if foreign key exists
-                result = await conn.execute(text("""
-                    SELECT COUNT(*) as count
-                    FROM information_schema.KEY_COLUMN_USAGE
-                    WHERE TABLE_SCHEMA = DATABASE()
-                    AND TABLE_NAME = 'plants'
-                    AND COLUMN_NAME = 'location_id'
-                    AND REFERENCED_TABLE_NAME = 'locations'
-                """))
-                row = result.fetchone()
-
-                if row[0] == 0:
-                    print("  Adding foreign key constraint for plants.location_id...")
-                    await conn.execute(text("""
-                        ALTER TABLE plants
-                        ADD CONSTRAINT fk_plants_location
-                        FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE SET NULL
-                    """))
-                    print("  ✓ Foreign key constraint added")
-                else:
-                    print("  ✓ Foreign key constraint already exists")
-            except Exception as e:
-                print(f"  Note: Foreign key constraint may already exist or error occurred: {e}")
+            if await get_schema_version(conn) == SCHEMA_FINGERPRINT:
+                logger.info(f"✓ Schema is already at version {SCHEMA_FINGERPRINT}, nothing to do\n")
+                return True
 
-            print("\nCleaning up old device-centric logging tables...")
-
-            # Drop old log_entries table if it exists
-            try:
-                result = await conn.execute(text("""
-                    SELECT COUNT(*) as count
-                    FROM information_schema.TABLES
-                    WHERE TABLE_SCHEMA = DATABASE()
-                    AND TABLE_NAME = 'log_entries'
-                """))
-                row = result.fetchone()
-                if row[0] > 0:
-                    print("  Dropping old 'log_entries' table...")
-                    await conn.execute(text("DROP TABLE log_entries"))
-                    print("  ✓ Table 'log_entries' dropped")
-                else:
-                    print("  ✓ Table 'log_entries' doesn't exist (already cleaned up)")
-            except Exception as e:
-                print(f"  Note: Error dropping log_entries table: {e}")
-
-            print("\nChecking 'device_links' table...")
-
-            # Add removed_at column to device_links table if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'device_links',
-                'removed_at',
-                "removed_at DATETIME NULL AFTER created_at"
-            )
-
-            print("\nChecking 'plant_reports' table...")
-
-            # Create plant_reports table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'plant_reports',
-                """
-                CREATE TABLE plant_reports (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    plant_id INT NOT NULL UNIQUE,
-                    generated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    report_version INT NOT NULL DEFAULT 1,
-                    plant_name VARCHAR(255) NOT NULL,
-                    strain VARCHAR(255) NULL,
-                    start_date DATETIME NULL,
-                    end_date DATETIME NULL,
-                    final_phase VARCHAR(50) NULL,
-                    raw_data LONGTEXT NOT NULL COMMENT 'JSON blob with all raw data',
-                    aggregated_stats TEXT NULL COMMENT 'JSON blob with aggregated statistics',
-                    INDEX idx_plant_id (plant_id),
-                    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
-
-            # Drop old environment_logs table if it exists
-            try:
-                result = await conn.execute(text("""
-                    SELECT COUNT(*) as count
-                    FROM information_schema.TABLES
-                    WHERE TABLE_SCHEMA = DATABASE()
-                    AND TABLE_NAME = 'environment_logs'
-                """))
-                row = result.fetchone()
-                if row[0] > 0:
-                    print("  Dropping old 'environment_logs' table...")
-                    await conn.execute(text("DROP TABLE environment_logs"))
-                    print("  ✓ Table 'environment_logs' dropped")
-                else:
-                    print("  ✓ Table 'environment_logs' doesn't exist (already cleaned up)")
-            except Exception as e:
-                print(f"  Note: Error dropping environment_logs table: {e}")
-
-            print("\nChecking 'plant_daily_logs' table...")
-
-            # Create plant_daily_logs table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'plant_daily_logs',
-                """
-                CREATE TABLE plant_daily_logs (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    plant_id INT NOT NULL,
-                    log_date DATE NOT NULL,
-
-                    -- Hydroponic data (min/max/avg for daily aggregation)
-                    ph_min FLOAT NULL,
-                    ph_max FLOAT NULL,
-                    ph_avg FLOAT NULL,
-                    ec_min FLOAT NULL,
-                    ec_max FLOAT NULL,
-                    ec_avg FLOAT NULL,
-                    tds_min FLOAT NULL,
-                    tds_max FLOAT NULL,
-                    tds_avg FLOAT NULL,
-                    water_temp_min FLOAT NULL,
-                    water_temp_max FLOAT NULL,
-                    water_temp_avg FLOAT NULL,
-
-                    -- Dosing totals for the day
-                    total_ph_up_ml FLOAT NULL DEFAULT 0.0,
-                    total_ph_down_ml FLOAT NULL DEFAULT 0.0,
-                    dosing_events_count INT NULL DEFAULT 0,
-
-                    -- Environmental data (min/max/avg for daily aggregation)
-                    co2_min INT NULL,
-                    co2_max INT NULL,
-                    co2_avg FLOAT NULL,
-                    air_temp_min FLOAT NULL,
-                    air_temp_max FLOAT NULL,
-                    air_temp_avg FLOAT NULL,
-                    humidity_min FLOAT NULL,
-                    humidity_max FLOAT NULL,
-                    humidity_avg FLOAT NULL,
-                    vpd_min FLOAT NULL,
-                    vpd_max FLOAT NULL,
-                    vpd_avg FLOAT NULL,
-
-                    -- Light tracking (based on threshold crossings)
-                    total_light_seconds INT NULL,
-                    light_cycles_count INT NULL,
-                    longest_light_period_seconds INT NULL,
-                    shortest_light_period_seconds INT NULL,
-
-                    -- Metadata
-                    hydro_device_id INT NULL,
-                    env_device_id INT NULL,
-                    last_hydro_reading DATETIME NULL,
-                    last_env_reading DATETIME NULL,
-                    readings_count INT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-
-                    -- Indexes
-                    INDEX idx_plant_id (plant_id),
-                    INDEX idx_log_date (log_date),
-                    INDEX idx_plant_date (plant_id, log_date),
-
-                    -- Unique constraint: one row per plant per day
-                    UNIQUE KEY uq_plant_date (plant_id, log_date),
-
-                    -- Foreign keys
-                    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE,
-                    FOREIGN KEY (hydro_device_id) REFERENCES devices(id) ON DELETE SET NULL,
-                    FOREIGN KEY (env_device_id) REFERENCES devices(id) ON DELETE SET NULL
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Plant-centric daily aggregated sensor logs'
-                """
-            )
-
-            # Add light tracking columns to plant_daily_logs if they don't exist
-            await check_and_add_column(
-                conn,
-                'plant_daily_logs',
-                'total_light_seconds',
-                "total_light_seconds INT NULL AFTER vpd_avg"
-            )
-            await check_and_add_column(
-                conn,
-                'plant_daily_logs',
-                'light_cycles_count',
-                "light_cycles_count INT NULL AFTER total_light_seconds"
-            )
-            await check_and_add_column(
-                conn,
-                'plant_daily_logs',
-                'longest_light_period_seconds',
-                "longest_light_period_seconds INT NULL AFTER light_cycles_count"
-            )
-            await check_and_add_column(
-                conn,
-                'plant_daily_logs',
-                'shortest_light_period_seconds',
-                "shortest_light_period_seconds INT NULL AFTER longest_light_period_seconds"
-            )
-
-            print("\nChecking 'device_posting_slots' table...")
-
-            # Create device_posting_slots table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'device_posting_slots',
-                """
-                CREATE TABLE device_posting_slots (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    device_id INT NOT NULL UNIQUE,
-                    assigned_minute INT NOT NULL COMMENT 'Minutes from posting window start (0-299 for 5-hour window)',
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_device_id (device_id),
-                    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Device daily posting time slots for load balancing'
-                """
-            )
-
-            print("\nChecking 'dosing_events' table...")
-
-            # Create dosing_events table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'dosing_events',
-                """
-                CREATE TABLE dosing_events (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    plant_id INT NOT NULL,
-                    device_id INT NOT NULL,
-                    event_date DATE NOT NULL COMMENT 'Date for quick daily queries',
-                    timestamp DATETIME NOT NULL COMMENT 'Exact time of dosing event',
-                    dosing_type VARCHAR(50) NOT NULL COMMENT 'ph_up, ph_down, nutrient_a, nutrient_b, etc.',
-                    amount_ml FLOAT NOT NULL COMMENT 'Amount dosed in milliliters',
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    INDEX idx_plant_id (plant_id),
-                    INDEX idx_device_id (device_id),
-                    INDEX idx_event_date (event_date),
-                    INDEX idx_plant_date (plant_id, event_date),
-                    INDEX idx_device_date (device_id, event_date),
-                    UNIQUE KEY uq_plant_timestamp_type (plant_id, timestamp, dosing_type),
-                    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE,
-                    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Individual dosing events from hydro controllers'
-                """
-            )
-
-            print("\nChecking 'light_events' table...")
-
-            # Create light_events table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'light_events',
-                """
-                CREATE TABLE light_events (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    plant_id INT NOT NULL,
-                    device_id INT NOT NULL,
-                    event_date DATE NOT NULL COMMENT 'Date for quick daily queries',
-                    start_time DATETIME NOT NULL COMMENT 'When lights came ON',
-                    end_time DATETIME NOT NULL COMMENT 'When lights went OFF',
-                    duration_seconds INT NOT NULL COMMENT 'How long lights were ON',
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    INDEX idx_plant_id (plant_id),
-                    INDEX idx_device_id (device_id),
-                    INDEX idx_event_date (event_date),
-                    INDEX idx_plant_date (plant_id, event_date),
-                    INDEX idx_device_date (device_id, event_date),
-                    UNIQUE KEY uq_plant_start_time (plant_id, start_time),
-                    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE,
-                    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Individual light ON/OFF events from environment sensors'
-                """
-            )
-
-            print("\nChecking 'notifications' table...")
-
-            # Create notifications table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'notifications',
-                """
-                CREATE TABLE notifications (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    device_id VARCHAR(100) NOT NULL COMMENT 'Device identifier (matches devices.device_id)',
-                    alert_type VARCHAR(100) NOT NULL COMMENT 'Alert type string (e.g., PH_OUT_OF_RANGE)',
-                    alert_type_id INT NOT NULL COMMENT 'Numeric alert type ID from device enum',
-                    severity ENUM('INFO', 'WARNING', 'CRITICAL') NOT NULL,
-                    status ENUM('ACTIVE', 'SELF_CLEARED', 'USER_CLEARED') NOT NULL DEFAULT 'ACTIVE',
-                    source VARCHAR(200) NOT NULL COMMENT 'Source component (e.g., pH Probe, EC Probe)',
-                    message TEXT NOT NULL COMMENT 'Detailed alert message',
-                    first_occurrence BIGINT UNSIGNED NOT NULL COMMENT 'Timestamp (millis) when first occurred',
-                    last_occurrence BIGINT UNSIGNED NULL COMMENT 'Timestamp (millis) when last reported',
-                    cleared_at BIGINT UNSIGNED NULL COMMENT 'Timestamp (millis) when cleared',
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    UNIQUE KEY unique_device_alert (device_id, alert_type),
-                    INDEX idx_status_cleared (status, cleared_at),
-                    INDEX idx_device_status (device_id, status),
-                    INDEX idx_severity (severity),
-                    INDEX idx_created_at (created_at)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Device notifications and alerts'
-                """
-            )
-
-            # Migrate existing notifications table to use uppercase enum values
-            # This is needed if table was created with lowercase values
-            try:
-                print("Migrating notifications table enum values to uppercase...")
-                # Check if table exists and needs migration
-                result = await conn.execute(text("""
-                    SELECT DATA_TYPE, COLUMN_TYPE
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_SCHEMA = DATABASE()
-                    AND TABLE_NAME = 'notifications'
-                    AND COLUMN_NAME = 'severity'
-                """))
-                severity_info = result.fetchone()
-
-                if severity_info and 'info' in severity_info[1]:
-                    print("  Migrating severity and status columns to uppercase enum values...")
-                    # Alter the columns to use uppercase enum values
-                    await conn.execute(text("""
-                        ALTER TABLE notifications
-                        MODIFY COLUMN severity ENUM('INFO', 'WARNING', 'CRITICAL') NOT NULL,
-                        MODIFY COLUMN status ENUM('ACTIVE', 'SELF_CLEARED', 'USER_CLEARED') NOT NULL DEFAULT 'ACTIVE'
-                    """))
-                    print("  ✓ Migration complete - enum values are now uppercase")
-                else:
-                    print("  ✓ Enum values already uppercase, no migration needed")
-            except Exception as e:
-                print(f"  Note: Could not check/migrate enum values: {e}")
-
-            print("\nChecking 'login_history' table...")
-
-            # Create login_history table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'login_history',
-                """
-                CREATE TABLE login_history (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    login_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    ip_address VARCHAR(45) NULL COMMENT 'Client IP address (IPv6 max length is 45)',
-                    user_agent VARCHAR(500) NULL COMMENT 'Client user agent string',
-                    INDEX idx_user_id (user_id),
-                    INDEX idx_login_at (login_at),
-                    INDEX idx_user_login (user_id, login_at),
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='User login history (max 10 records per user)'
-                """
-            )
-
-            print("\nChecking 'grower_profiles' table...")
-
-            # Create grower_profiles table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'grower_profiles',
-                """
-                CREATE TABLE grower_profiles (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NOT NULL UNIQUE,
-                    business_name VARCHAR(255),
-                    bio TEXT,
-                    location VARCHAR(255),
-                    website VARCHAR(500),
-                    instagram VARCHAR(100),
-                    is_public BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    INDEX idx_public (is_public),
-                    INDEX idx_business_name (business_name)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-            )
-
-            print("\nChecking 'product_locations' table...")
-
-            # Create product_locations table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'product_locations',
-                """
-                CREATE TABLE product_locations (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    store_name VARCHAR(255) NOT NULL,
-                    store_link VARCHAR(500),
-                    store_phone VARCHAR(20),
-                    store_email VARCHAR(255),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    INDEX idx_user (user_id)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-            )
-
-            print("\nChecking 'published_reports' table...")
-
-            # Create published_reports table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'published_reports',
-                """
-                CREATE TABLE published_reports (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    plant_id VARCHAR(36) NOT NULL,
-                    plant_name VARCHAR(255) NOT NULL,
-                    strain VARCHAR(255),
-                    start_date DATE,
-                    end_date DATE,
-                    final_phase VARCHAR(50),
-                    report_data JSON NOT NULL,
-                    published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    unpublished_at TIMESTAMP NULL,
-                    views_count INT DEFAULT 0,
-                    grower_notes TEXT,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    INDEX idx_user (user_id),
-                    INDEX idx_published_at (published_at),
-                    INDEX idx_strain (strain),
-                    INDEX idx_views (views_count),
-                    INDEX idx_unpublished (unpublished_at)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-            )
-
-            # Add show_on_profile column to published_reports if it doesn't exist
-            await check_and_add_column(
-                conn,
-                'published_reports',
-                'show_on_profile',
-                "show_on_profile BOOLEAN NOT NULL DEFAULT TRUE AFTER grower_notes"
-            )
-
-            print("\nChecking 'upcoming_strains' table...")
-
-            # Create upcoming_strains table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'upcoming_strains',
-                """
-                CREATE TABLE upcoming_strains (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    strain_name VARCHAR(255) NOT NULL,
-                    description TEXT,
-                    expected_start_date DATE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    INDEX idx_user (user_id)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-            )
-
-            print("\nChecking 'strain_reviews' table...")
-
-            # Create strain_reviews table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'strain_reviews',
-                """
-                CREATE TABLE strain_reviews (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    published_report_id INT NOT NULL,
-                    reviewer_id INT NOT NULL,
-                    rating INT NOT NULL CHECK (rating >= 1 AND rating <= 5),
-                    comment TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (published_report_id) REFERENCES published_reports(id) ON DELETE CASCADE,
-                    FOREIGN KEY (reviewer_id) REFERENCES users(id) ON DELETE CASCADE,
-                    UNIQUE KEY unique_review (published_report_id, reviewer_id),
-                    INDEX idx_report (published_report_id),
-                    INDEX idx_reviewer (reviewer_id),
-                    INDEX idx_rating (rating)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-            )
-
-            print("\nChecking 'review_responses' table...")
-
-            # Create review_responses table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'review_responses',
-                """
-                CREATE TABLE review_responses (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    review_id INT NOT NULL,
-                    grower_id INT NOT NULL,
-                    response_text TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (review_id) REFERENCES strain_reviews(id) ON DELETE CASCADE,
-                    FOREIGN KEY (grower_id) REFERENCES users(id) ON DELETE CASCADE,
-                    UNIQUE KEY unique_response (review_id),
-                    INDEX idx_review (review_id),
-                    INDEX idx_grower (grower_id)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-            )
-
-            print("\nChecking 'admin_settings' table...")
-
-            # Create admin_settings table if it doesn't exist
-            await check_and_create_table(
-                conn,
-                'admin_settings',
-                """
-                CREATE TABLE admin_settings (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    setting_key VARCHAR(100) NOT NULL UNIQUE,
-                    setting_value TEXT,
-                    description TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_key (setting_key)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-                """
-            )
+            # Before any CREATE, so new tables inherit the right collation
+            await ensure_database_collation(conn)
+            # Model tables first, so the ALTERs below find users/devices/plants on a fresh database
+            await conn.run_sync(Base.metadata.create_all)
+
+            # One read of information_schema; the checks below consult this snapshot
+            schema = await load_schema_snapshot()
+            # Column/default/FK changes are queued per table and applied together at the end
+            alters = {}
+
+            # Skip FK/unique validation while creating tables and altering columns;
+            # the new FK columns are all NULL, so there is nothing to validate
+            async with relaxed_checks(conn):
+                logger.info("Checking tables...")
+                await create_missing_tables(conn, schema)
+
+                logger.info("\nCleaning up old device-centric logging tables...")
+                for table_name in LEGACY_TABLES:
+                    try:
+                        if table_name in schema.tables:
+                            logger.info(f"  Dropping old '{table_name}' table...")
+                            await conn.execute(text(f"DROP TABLE {quote_identifier(table_name)}"))
+                            logger.info(f"  ✓ Table '{table_name}' dropped")
+                        else:
+                            logger.debug(f"  ✓ Table '{table_name}' doesn't exist (already cleaned up)")
+                    except Exception as e:
+                        logger.warning(f"  Note: Error dropping {table_name} table: {e}")
+
+                logger.info("\nChecking columns...")
+                for table_name, column_name, column_definition in DESIRED_COLUMNS:
+                    check_and_add_column(alters, schema, table_name, column_name, column_definition)
+                for table_name, column_name, new_default in DESIRED_DEFAULTS:
+                    check_and_modify_column_default(alters, schema, table_name, column_name, new_default)
+                for table_name, column_name, referenced_table, constraint_sql in DESIRED_FOREIGN_KEYS:
+                    check_and_add_foreign_key(alters, schema, table_name, column_name, referenced_table, constraint_sql)
+
+                # Migrate existing notifications table to use uppercase enum values
+                # This is needed if table was created with lowercase values
+                severity_info = schema.columns.get('notifications', {}).get('severity')
+                if severity_info and severity_info[0] and 'info' in severity_info[0]:
+                    alters.setdefault('notifications', []).extend([
+                        ("severity enum (uppercase)", "MODIFY COLUMN severity ENUM('INFO', 'WARNING', 'CRITICAL') NOT NULL"),
+                        ("status enum (uppercase)", "MODIFY COLUMN status ENUM('ACTIVE', 'SELF_CLEARED', 'USER_CLEARED') NOT NULL DEFAULT 'ACTIVE'"),
+                    ])
+
+                if alters:
+                    logger.info("\nApplying queued column changes...")
+                    await apply_pending_alters(schema, alters)
 
             # Insert default admin settings
             try:
-                result = await conn.execute(text("""
-                    SELECT COUNT(*) as count FROM admin_settings
-                    WHERE setting_key = 'allow_anonymous_browsing'
-                """))
-                row = result.fetchone()
-
-                if row[0] == 0:
-                    print("  Inserting default admin settings...")
-                    await conn.execute(text("""
-                        INSERT INTO admin_settings (setting_key, setting_value, description)
-                        VALUES ('allow_anonymous_browsing', 'true', 'Allow non-logged-in users to browse published reports and grower profiles')
-                    """))
-                    print("  ✓ Default admin settings inserted")
-                else:
-                    print("  ✓ Admin settings already exist")
+                await conn.execute(_SEED_ADMIN_SETTINGS)
+                logger.info("  ✓ Default admin settings present")
             except Exception as e:
-                print(f"  Note: Could not insert default admin settings: {e}")
+                logger.warning(f"  Note: Could not insert default admin settings: {e}")
 
-            print("\n" + "="*80)
-            print("✓ Database initialization complete!")
-            print("="*80 + "\n")
+            if schema.failed:
+                logger.error(f"\n✗ Some steps failed ({', '.join(schema.failed)}); schema version not recorded")
+            else:
+                await set_schema_version(conn, SCHEMA_FINGERPRINT)
+                logger.info(f"\n✓ Schema version {SCHEMA_FINGERPRINT} recorded")
+
+            logger.info("\n" + "="*80)
+            logger.info("✓ Database initialization complete!")
+            logger.info("="*80 + "\n")
             return True
             
+    except DatabaseCollationError as e:
+        # Fatal: carrying on would create tables with the server's default collation
+        logger.error(f"\n✗ {e}\n")
+        raise
     except Exception as e:
-        print(f"\n✗ Database initialization failed: {e}\n")
+        logger.error(f"\n✗ Database initialization failed: {e}\n")
         return False
-    finally:
-        await engine.dispose()
+
+async def init_database_locked():
+    """
+    Run init_database() while holding the INIT_LOCK_NAME named lock. With several
+    worker processes only one runs the checks at a time; the others wait (with no
+    limit, since a table rebuild can take a while), then find the schema version
+    already recorded. The lock belongs to a dedicated connection, so it is released
+    even if the holder's connection drops.
+    """
+    try:
+        async with engine.connect() as lock_conn:
+            while True:
+                result = await lock_conn.execute(_GET_INIT_LOCK, {"name": INIT_LOCK_NAME, "timeout": INIT_LOCK_WAIT})
+                acquired = result.scalar()
+                if acquired == 1:
+                    break
+                if acquired is None:
+                    logger.error("✗ GET_LOCK failed while waiting for the database init lock")
+                    return False
+                logger.info("  Another process is initializing the database, still waiting...")
+            try:
+                return await init_database()
+            finally:
+                try:
+                    await lock_conn.execute(_RELEASE_INIT_LOCK, {"name": INIT_LOCK_NAME})
+                except Exception as e:
+                    logger.warning(f"  Note: Could not release the init lock ({e}); it is dropped with the connection")
+    except DatabaseCollationError:
+        raise
+    except Exception as e:
+        logger.error(f"\n✗ Could not take the database init lock: {e}\n")
+        return False
+
+async def ensure_initialized():
+    """
+    Run init_database() at most once per process, and one process at a time
+    (see init_database_locked). Concurrent callers wait for the first one.
+    Returns False if the run failed; callers must not serve traffic in that case
+    (on_startup raises). A later call would retry the run.
+    """
+    if _init_done.is_set():
+        return True
+    async with _init_lock:
+        if not _init_done.is_set():
+            if not await init_database_locked():
+                return False
+            _init_done.set()
+    return True
 
 async def verify_database_schema():
     """Verify that all required columns exist in the database."""
-    print("\n" + "="*80)
-    print("DATABASE SCHEMA VERIFICATION")
-    print("="*80)
+    logger.info("\n" + "="*80)
+    logger.info("DATABASE SCHEMA VERIFICATION")
+    logger.info("="*80)
     
     if not DATABASE_URL:
-        print("✗ DATABASE_URL not found in environment variables")
+        logger.error("✗ DATABASE_URL not found in environment variables")
         return False
     
-    engine = create_async_engine(DATABASE_URL)
-    
     try:
         async with engine.begin() as conn:
-            print("Verifying database schema...")
-            
-            # Check for required columns
-            required_columns = [
-                ('users', 'id'),
-                ('users', 'email'),
-                ('users', 'hashed_password'),
-                ('users', 'first_name'),
-                ('users', 'last_name'),
-                ('users', 'is_active'),
-                ('users', 'is_superuser'),
-                ('users', 'is_verified'),
-            ]
+            logger.info("Verifying database schema...")
             
+            # One lookup narrowed to the required names, then check the exact pairs in Python
+            result = await conn.execute(_REQUIRED_COLUMNS_PRESENT, {
+                "table_names": sorted({table for table, _ in REQUIRED_COLUMNS}),
+                "column_names": sorted({column for _, column in REQUIRED_COLUMNS}),
+            })
+            present = {(table, column) for table, column in result.fetchall()}
+
             all_exist = True
-            for table, column in required_columns:
-                result = await conn.execute(text(f"""
-                    SELECT COUNT(*) as count
-                    FROM information_schema.COLUMNS
-                    WHERE TABLE_SCHEMA = DATABASE()
-                    AND TABLE_NAME = '{table}'
-                    AND COLUMN_NAME = '{column}'
-                """))
-                row = result.fetchone()
-                
-                if row[0] > 0:
-                    print(f"  ✓ {table}.{column} exists")
+            for table, column in REQUIRED_COLUMNS:
+                if (table, column) in present:
+                    logger.debug(f"  ✓ {table}.{column} exists")
                 else:
-                    print(f"  ✗ {table}.{column} MISSING")
+                    logger.error(f"  ✗ {table}.{column} MISSING")
                     all_exist = False
             
-            print("\n" + "="*80)
+            logger.info("\n" + "="*80)
             if all_exist:
-                print("✓ All required columns exist!")
+                logger.info("✓ All required columns exist!")
             else:
-                print("✗ Some columns are missing. Run init_database() to fix.")
-            print("="*80 + "\n")
+                logger.error("✗ Some columns are missing. Run init_database() to fix.")
+            logger.info("="*80 + "\n")
             
             return all_exist
             
     except Exception as e:
-        print(f"\n✗ Schema verification failed: {e}\n")
+        logger.error(f"\n✗ Schema verification failed: {e}\n")
         return False
+
+async def _run_standalone():
+    try:
+        await ensure_initialized()
     finally:
+        await script_engine.dispose()
         await engine.dispose()
 
 # Can be run standalone
 if __name__ == "__main__":
-    asyncio.run(init_database())
\ No newline at end of file
+    asyncio.run(_run_standalone())
\ No newline at end of file
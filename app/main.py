@@ -19,7 +19,6 @@ from fastapi.security import OAuth2AuthorizationCodeBearer, OAuth2PasswordReques
 from httpx_oauth.clients.google import GoogleOAuth2
 from fastapi_users import schemas, exceptions
 from pydantic import BaseModel, EmailStr
-from dotenv import load_dotenv
 import os
 import secrets  # Added for API key
 import jwt  # Added for WebSocket JWT decoding
@@ -34,29 +33,37 @@ from collections import defaultdict
 import json
 from sqlalchemy import update, delete, and_, or_
 
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
-print("Loaded DATABASE_URL from .env:", DATABASE_URL)  # Debug print
-DATABASE_URL = DATABASE_URL.replace("mariadb+mariadbconnector", "mariadb+aiomysql") if DATABASE_URL else None
-print("Modified DATABASE_URL for async:", DATABASE_URL)  # Debug print
-SECRET = os.getenv("SECRET_KEY") or "secret"
-SERVER_URL = os.getenv("SERVER_URL")
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
-
-engine = create_async_engine(
+# Database engine/session and auth wiring live in app/database.py and app/auth.py;
+# re-exported here for modules that import them from app.main
+from app.database import (
     DATABASE_URL,
-    connect_args={
-        "init_command": "SET time_zone='+00:00'"  # Force UTC for all sessions
-    }
+    DB_POOL_SIZE,
+    engine,
+    async_session_maker,
+    create_db_and_tables,
+    warmup_pool,
+    DBSessionMiddleware,
+    get_db,
+)
+from app.auth import (
+    SECRET,
+    SERVER_URL,
+    GOOGLE_CLIENT_ID,
+    GOOGLE_CLIENT_SECRET,
+    GOOGLE_REDIRECT_URI,
+    CustomSQLAlchemyUserDatabase,
+    CustomUserManager,
+    get_user_db,
+    get_user_manager,
+    cookie_transport,
+    ClaimsJWTStrategy,
+    get_jwt_strategy,
+    auth_backend,
+    google_oauth_client,
+    fastapi_users,
+    current_user,
+    current_admin,
 )
-
-class AsyncSessionGreenlet(AsyncSession):
-    def __init__(self, *args, **kwargs):
-        super().__init__(sync_session_class=Session, *args, **kwargs)
-
-async_session_maker = async_sessionmaker(engine, class_=AsyncSessionGreenlet, expire_on_commit=False)
 
 # Import models from models package
 from app.models import (
@@ -77,10 +84,6 @@ from app.models import (
     NotificationStatus,
 )
 
-async def create_db_and_tables():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
 # Import Pydantic schemas from schemas package
 from app.schemas import (
     UserRead,
@@ -119,280 +122,6 @@ from app.schemas import (
     PlantDailyLogRead,
 )
 
-class CustomSQLAlchemyUserDatabase(SQLAlchemyUserDatabase[User, int]):
-    async def add_oauth_account(
-        self, user: User, create_dict: Dict[str, Any]
-    ) -> User:
-        # Preload oauth_accounts to avoid lazy loading
-        stmt = (
-            select(self.user_table)
-            .options(selectinload(self.user_table.oauth_accounts))
-            .where(self.user_table.id == user.id)
-        )
-        result = await self.session.execute(stmt)
-        user = result.scalars().one_or_none()
-        if user is None:
-            raise ValueError("User not found")
-
-        if self.oauth_account_table is None:
-            raise ValueError("No OAuth account table configured.")
-
-        oauth_account = self.oauth_account_table(**create_dict)
-        self.session.add(oauth_account)
-        user.oauth_accounts.append(oauth_account)
-        await self.session.commit()
-        return user
-
-class CustomUserManager(IntegerIDMixin, BaseUserManager[User, int]):
-    reset_password_token_secret = SECRET
-    verification_token_secret = SECRET
-
-    async def create(self, user_create, safe: bool = False, request = None):
-        """Override create to ensure is_suspended is set"""
-        # Call parent create
-        user = await super().create(user_create, safe=safe, request=request)
-
-        # Explicitly ensure is_suspended is False if not already set
-        if not hasattr(user, 'is_suspended') or user.is_suspended is None:
-            await self.user_db.update(user, {"is_suspended": False})
-            await self.user_db.session.refresh(user)
-            print(f"Explicitly set is_suspended=False for user {user.email}")
-
-        return user
-
-    async def on_after_register(self, user: User, request: None = None):
-        print(f"User {user.email} (id={user.id}) has registered and is pending approval.")
-
-    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
-        """
-        Override authenticate to check if user is active (not pending)
-        """
-        try:
-            user = await self.get_by_email(credentials.username)
-        except exceptions.UserNotExists:
-            # Run the hasher to mitigate timing attack
-            self.password_helper.hash(credentials.password)
-            return None
-
-        verified, updated_password_hash = self.password_helper.verify_and_update(
-            credentials.password, user.hashed_password
-        )
-        if not verified:
-            return None
-
-        # Check if user is suspended (handle None as False)
-        is_suspended = getattr(user, 'is_suspended', None)
-        is_active = user.is_active
-
-        # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
-        if is_suspended is None or is_suspended is False or is_suspended == 0:
-            is_suspended = False
-        else:
-            is_suspended = True
-
-        if is_suspended:
-            raise HTTPException(
-                status_code=403,
-                detail="SUSPENDED"
-            )
-
-        # Check if user is pending approval
-        if not is_active:
-            raise HTTPException(
-                status_code=403,
-                detail="PENDING_APPROVAL"
-            )
-        
-        # Update password hash to a more robust one if needed
-        if updated_password_hash is not None:
-            await self.user_db.update(user, {"hashed_password": updated_password_hash})
-
-        return user
-
-    async def oauth_callback(
-        self,
-        oauth_name: str,
-        access_token: str,
-        account_id: str,
-        account_email: str,
-        expires_at: Optional[int] = None,
-        refresh_token: Optional[str] = None,
-        request: Optional[Request] = None,
-        *,
-        associate_by_email: bool = False,
-        is_verified_by_default: bool = False,
-    ) -> User:
-        print(f"OAuth callback START for {account_email}")
-        try:
-            oauth_account_dict = {
-                "oauth_name": oauth_name,
-                "access_token": access_token,
-                "account_id": account_id,
-                "account_email": account_email,
-                "expires_at": expires_at,
-                "refresh_token": refresh_token,
-            }
-
-            try:
-                user = await self.get_by_oauth_account(oauth_name, account_id)
-                print(f"Existing OAuth user found: {account_email}")
-                # User already has this OAuth account linked, just return them
-            except exceptions.UserNotExists:
-                user = None
-                print(f"No existing OAuth user for {account_email}")
-
-                # Try to find user by email and link OAuth account
-                if associate_by_email:
-                    try:
-                        user = await self.get_by_email(account_email)
-                        if user:
-                            # Eagerly load oauth_accounts to avoid lazy load in the check
-                            stmt = (
-                                select(User)
-                                .options(selectinload(User.oauth_accounts))
-                                .where(User.email == account_email)
-                            )
-                            result = await self.user_db.session.execute(stmt)
-                            user = result.scalars().one_or_none()
-
-                            # Check if user already has this OAuth account
-                            has_oauth = False
-                            for existing_oauth_account in user.oauth_accounts:
-                                if existing_oauth_account.oauth_name == oauth_name:
-                                    has_oauth = True
-                                    break
-
-                            # Only add OAuth account if not already linked
-                            if not has_oauth:
-                                user = await self.user_db.add_oauth_account(user, oauth_account_dict)
-                                print(f"OAuth account linked to existing user {account_email}")
-                    except exceptions.UserNotExists:
-                        pass
-
-            if not user:
-                # Google OAuth users also require approval (is_active=False)
-                # Generate a random secure password (OAuth users won't use it)
-                random_password = secrets.token_urlsafe(32)
-                user_create = UserCreate(
-                    email=account_email,
-                    password=random_password,  # Random password for OAuth users (not used)
-                    is_verified=is_verified_by_default,
-                    is_active=False,  # Require approval for OAuth users
-                    is_suspended=False  # Explicitly set not suspended
-                )
-                user = await self.create(user_create)
-
-                # Refresh user from database to get all fields
-                await self.user_db.session.refresh(user)
-
-                # Debug: Check what was actually saved
-                print(f"OAuth user created: email={user.email}, is_active={user.is_active}, is_suspended={getattr(user, 'is_suspended', 'MISSING')}")
-
-                try:
-                    user = await self.user_db.add_oauth_account(user, oauth_account_dict)
-                    print(f"OAuth account successfully linked for {user.email}")
-                except Exception as e:
-                    print(f"ERROR linking OAuth account for {user.email}: {e}")
-                    raise
-
-            # Note: We don't check for suspended/pending here because OAuth callback
-            # should always succeed and set the cookie. The checks happen when the user
-            # tries to access protected routes via the current_user dependency.
-            print(f"OAuth callback complete for {user.email}, is_active={user.is_active}, is_suspended={getattr(user, 'is_suspended', None)}")
-            return user
-        except Exception as e:
-            print(f"ERROR in OAuth callback for {account_email}: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
-
-async def get_db():
-    async with async_session_maker() as session:
-        yield session
-
-async def get_user_db(session: AsyncSession = Depends(get_db)):
-    yield CustomSQLAlchemyUserDatabase(session, User, oauth_account_table=OAuthAccount)
-
-async def get_user_manager(user_db: CustomSQLAlchemyUserDatabase = Depends(get_user_db)):
-    yield CustomUserManager(user_db)
-
-cookie_transport = CookieTransport(cookie_name="auth_cookie", cookie_max_age=3600)
-
-def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=SECRET, lifetime_seconds=3600)
-
-auth_backend = AuthenticationBackend(
-    name="jwt",
-    transport=cookie_transport,
-    get_strategy=get_jwt_strategy,
-)
-
-google_oauth_client = GoogleOAuth2(GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET)
-
-fastapi_users = FastAPIUsers[User, int](
-    get_user_manager,
-    [auth_backend],
-)
-
-_base_current_user = fastapi_users.current_user(active=False)  # Don't check active here
-_base_current_admin = fastapi_users.current_user(active=False, superuser=True)  # Don't check active here
-
-# Custom dependency to check for suspended and pending users
-async def current_user(user: User = Depends(_base_current_user)) -> User:
-    """Check if user is suspended or pending before allowing access"""
-    # Check if user is suspended (handle None as False)
-    is_suspended = getattr(user, 'is_suspended', None)
-    is_active = user.is_active
-
-    # Debug logging
-    print(f"current_user check for {user.email}: is_suspended={is_suspended}, is_active={is_active}")
-
-    # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
-    if is_suspended is None or is_suspended is False or is_suspended == 0:
-        is_suspended = False
-    else:
-        is_suspended = True
-
-    if is_suspended:
-        print(f"User {user.email} is SUSPENDED - showing suspended page")
-        raise HTTPException(
-            status_code=403,
-            detail="SUSPENDED"
-        )
-    # Check if user is pending approval
-    if not is_active:
-        print(f"User {user.email} is PENDING - showing pending approval page")
-        raise HTTPException(
-            status_code=403,
-            detail="PENDING_APPROVAL"
-        )
-    return user
-
-async def current_admin(user: User = Depends(_base_current_admin)) -> User:
-    """Check if admin is suspended or pending before allowing access"""
-    # Check if user is suspended (handle None as False)
-    is_suspended = getattr(user, 'is_suspended', None)
-    is_active = user.is_active
-
-    # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
-    if is_suspended is None or is_suspended is False or is_suspended == 0:
-        is_suspended = False
-    else:
-        is_suspended = True
-
-    if is_suspended:
-        raise HTTPException(
-            status_code=403,
-            detail="SUSPENDED"
-        )
-    # Check if user is pending approval
-    if not is_active:
-        raise HTTPException(
-            status_code=403,
-            detail="PENDING_APPROVAL"
-        )
-    return user
-
 app = FastAPI()
 
 # Add CORS middleware to allow cross-origin requests from pH dosing systems
@@ -404,6 +133,9 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# One database session per request (see get_db)
+app.add_middleware(DBSessionMiddleware)
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
@@ -524,12 +256,17 @@ async def cleanup_old_notifications_task():
 
 @app.on_event("startup")
 async def on_startup():
-    # Initialize database schema (add missing columns if needed)
-    from app.init_database import init_database
-    await init_database()
+    # init_database sets the database collation and creates the model tables before
+    # bringing older databases' columns up to date (skipped when the schema version matches);
+    # create_all then only picks up models added since the last recorded version
+    from app.init_database import ensure_initialized
+    if not await ensure_initialized():
+        # Don't serve requests against a schema another worker may still be changing
+        raise RuntimeError("Database initialization failed; see the log above")
 
     await create_db_and_tables()
     print("Tables created or already exist.")
+    await warmup_pool()
     async with async_session_maker() as session:
         result = await session.execute(select(User).where(User.email == os.getenv("ADMIN_USERNAME")))
         admin = result.scalars().first()
@@ -47,7 +47,6 @@ class Notification(Base):
     __table_args__ = (
         Index('unique_device_alert', 'device_id', 'alert_type', unique=True),
         Index('idx_status_cleared', 'status', 'cleared_at'),
-        Index('idx_device_status', 'device_id', 'status'),
-        Index('idx_severity', 'severity'),
+        Index('idx_device_status_severity', 'device_id', 'status', 'severity'),  # list/summary counts
         Index('idx_created_at', 'created_at'),
     )
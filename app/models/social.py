@@ -109,6 +109,12 @@ class PublishedReport(Base):
     )
     reviews = relationship("StrainReview", back_populates="report", cascade="all, delete-orphan")
 
+    # report_data JSON dominates the row size; MariaDB page compression shrinks it on disk
+    # (ROW_FORMAT=COMPRESSED is deprecated and read-only by default on 10.6.0-10.6.5)
+    __table_args__ = {
+        "mysql_page_compressed": "1",
+    }
+
 
 class UpcomingStrain(Base):
     __tablename__ = "upcoming_strains"
@@ -13,30 +13,14 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
+from app.auth import current_admin
+from app.database import get_db
 from app.models import User
 
 # Create main admin router
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-def get_current_admin_dependency():
-    """Import and return current_admin dependency"""
-    from app.main import current_admin
-    return current_admin
-
-
-def get_db_dependency():
-    """Import and return get_db dependency"""
-    from app.main import get_db
-    return get_db
-
-
-def get_user_manager_dependency():
-    """Import and return get_user_manager dependency"""
-    from app.main import get_user_manager
-    return get_user_manager
-
-
 def get_templates():
     """Import and return templates"""
     from app.main import templates
@@ -47,8 +31,8 @@ def get_templates():
 @router.get("", response_class=HTMLResponse)
 async def admin_dashboard_page(
     request: Request,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Admin dashboard page"""
     pending_result = await session.execute(
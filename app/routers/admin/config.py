@@ -9,21 +9,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from pydantic import BaseModel
 
+from app.auth import current_admin
+from app.database import get_db
 from app.models import User
 
 router = APIRouter()
 
 
-def _get_current_admin():
-    from app.main import current_admin
-    return current_admin
-
-
-def _get_db():
-    from app.main import get_db
-    return get_db
-
-
 def _get_templates():
     from app.main import templates
     return templates
@@ -49,8 +41,8 @@ class LoggingConfigUpdate(BaseModel):
 @router.get("/config", response_class=HTMLResponse)
 async def system_config_page(
     request: Request,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """System Configuration page"""
     # Count pending users for sidebar badge
@@ -72,7 +64,7 @@ async def system_config_page(
 
 @router.get("/config/logging")
 async def get_logging_config(
-    admin: User = Depends(_get_current_admin())
+    admin: User = Depends(current_admin)
 ) -> Dict:
     """Get current logging configuration"""
     return system_config["logging"]
@@ -81,7 +73,7 @@ async def get_logging_config(
 @router.post("/config/logging")
 async def update_logging_config(
     config: LoggingConfigUpdate,
-    admin: User = Depends(_get_current_admin())
+    admin: User = Depends(current_admin)
 ) -> Dict:
     """Update logging configuration"""
     # Validate hours
@@ -7,25 +7,17 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
+from app.auth import current_admin
+from app.database import get_db
 from app.models import User, Device, Plant, PlantDailyLog, Location
 
 router = APIRouter()
 
 
-def _get_current_admin():
-    from app.main import current_admin
-    return current_admin
-
-
-def _get_db():
-    from app.main import get_db
-    return get_db
-
-
 @router.get("/api/dashboard/stats")
 async def get_dashboard_stats(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get dashboard statistics"""
     # Users
@@ -70,8 +62,8 @@ async def get_dashboard_stats(
 
 @router.get("/api/dashboard/alerts")
 async def get_dashboard_alerts(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get system alerts"""
     alerts = []
@@ -140,8 +132,8 @@ async def get_dashboard_alerts(
 
 @router.get("/api/dashboard/activity")
 async def get_dashboard_activity(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get recent activity feed - shows meaningful events only"""
     from app.models import Plant, LoginHistory
@@ -224,8 +216,8 @@ async def get_dashboard_activity(
 
 @router.get("/api/dashboard/device-status")
 async def get_dashboard_device_status(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get device status breakdown"""
     # Online/offline counts
@@ -261,8 +253,8 @@ async def get_dashboard_device_status(
 
 @router.get("/api/dashboard/firmware-status")
 async def get_dashboard_firmware_status(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get firmware deployment status"""
     try:
@@ -309,8 +301,8 @@ async def get_dashboard_firmware_status(
 
 @router.get("/api/dashboard/recent-users")
 async def get_dashboard_recent_users(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get recent users with device counts"""
     users_result = await session.execute(
@@ -338,8 +330,8 @@ async def get_dashboard_recent_users(
 
 @router.get("/api/dashboard/recent-devices")
 async def get_dashboard_recent_devices(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get recent devices"""
     devices_result = await session.execute(
@@ -365,8 +357,8 @@ async def get_dashboard_recent_devices(
 
 @router.get("/api/dashboard/device-posting-activity")
 async def get_device_posting_activity(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get device posting activity for the dashboard"""
     from app.models import DeviceAssignment
@@ -451,8 +443,8 @@ async def get_device_posting_activity(
 
 @router.get("/api/dashboard/plant-data-summary")
 async def get_plant_data_summary(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get plant data summary for the dashboard"""
     today = datetime.utcnow().date()
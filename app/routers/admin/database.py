@@ -8,22 +8,14 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, update, delete
 
+from app.auth import current_admin
+from app.database import get_db
 from app.models import User, Device, Plant, PlantDailyLog, PlantReport
 from app.services.data_retention import get_purge_candidates, purge_old_data
 
 router = APIRouter()
 
 
-def _get_current_admin():
-    from app.main import current_admin
-    return current_admin
-
-
-def _get_db():
-    from app.main import get_db
-    return get_db
-
-
 def _get_templates():
     from app.main import templates
     return templates
@@ -34,8 +26,8 @@ def _get_templates():
 @router.get("/database", response_class=HTMLResponse)
 async def admin_database_page(
     request: Request,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Admin database management page"""
     # Count pending users for sidebar badge
@@ -56,8 +48,8 @@ async def admin_database_page(
 
 @router.get("/data-retention/preview")
 async def preview_data_purge(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db()),
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db),
     retention_days: int = 30
 ):
     """Preview what data would be purged based on retention policy."""
@@ -78,8 +70,8 @@ async def preview_data_purge(
 
 @router.post("/data-retention/purge")
 async def execute_data_purge(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db()),
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db),
     retention_days: int = 30,
     confirm: bool = False
 ):
@@ -109,8 +101,8 @@ async def execute_data_purge(
 
 @router.get("/data-retention/stats")
 async def get_data_retention_stats(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get overall data retention statistics."""
     # Total plant daily logs
@@ -171,8 +163,8 @@ async def get_data_retention_stats(
 
 @router.get("/legacy-logs/summary")
 async def get_legacy_logs_summary(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get summary of legacy log entries. Tables removed - returns empty."""
     return {
@@ -192,8 +184,8 @@ async def get_legacy_logs_summary(
 @router.get("/legacy-logs/by-plant/{plant_id}")
 async def get_legacy_logs_for_plant(
     plant_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db()),
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db),
     limit: int = 100
 ):
     """Get legacy log entries for a specific plant. Tables removed - returns empty."""
@@ -219,8 +211,8 @@ async def get_legacy_logs_for_plant(
 async def associate_legacy_logs_to_device(
     plant_id: str,
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Associate legacy log entries to a device. Tables removed - no-op."""
     return {
@@ -234,8 +226,8 @@ async def associate_legacy_logs_to_device(
 
 @router.delete("/legacy-logs/purge")
 async def purge_legacy_logs(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db()),
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db),
     plant_id: Optional[str] = None,
     confirm: bool = False
 ):
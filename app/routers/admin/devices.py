@@ -12,6 +12,8 @@ from fastapi.responses import HTMLResponse, FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, update
 
+from app.auth import current_admin
+from app.database import get_db
 from app.models import User, Device, Plant, DeviceAssignment, PlantDailyLog, DeviceDebugLog
 
 # Log storage directory
@@ -20,16 +22,6 @@ LOGS_DIR = Path("logs/device_debug")
 router = APIRouter()
 
 
-def _get_current_admin():
-    from app.main import current_admin
-    return current_admin
-
-
-def _get_db():
-    from app.main import get_db
-    return get_db
-
-
 def _get_templates():
     from app.main import templates
     return templates
@@ -39,8 +31,8 @@ def _get_templates():
 @router.get("/devices", response_class=HTMLResponse)
 async def admin_devices_page(
     request: Request,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Admin devices management page"""
     # Count pending users for sidebar badge
@@ -59,8 +51,8 @@ async def admin_devices_page(
 
 @router.get("/all-devices")
 async def get_all_devices(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all devices in the system"""
     result = await session.execute(
@@ -107,8 +99,8 @@ async def get_all_devices(
 @router.get("/devices/{device_id}/data")
 async def get_device_data(
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db()),
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db),
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     limit: int = 1000
@@ -247,8 +239,8 @@ async def get_device_data(
 @router.get("/devices/{device_id}/data/summary")
 async def get_device_data_summary(
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get a summary of all data stored for a device."""
     # Get device
@@ -341,8 +333,8 @@ async def get_device_data_summary(
 @router.get("/devices/{device_id}/heartbeat-settings")
 async def get_device_heartbeat_settings(
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get heartbeat settings for a device (admin only)."""
     result = await session.execute(
@@ -374,8 +366,8 @@ async def get_device_heartbeat_settings(
 @router.put("/devices/{device_id}/heartbeat-settings")
 async def update_device_heartbeat_settings(
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db()),
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db),
     use_fahrenheit: Optional[bool] = None,
     update_interval: Optional[int] = None,
     log_interval: Optional[int] = None
@@ -449,8 +441,8 @@ async def update_device_heartbeat_settings(
 @router.put("/devices/{device_id}/reboot")
 async def queue_device_reboot(
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Queue a reboot command for a device (admin only).
 
@@ -496,8 +488,8 @@ async def queue_device_reboot(
 async def request_device_log(
     device_id: str,
     duration: int,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Request a debug log capture from a device.
 
@@ -587,8 +579,8 @@ async def request_device_log(
 @router.get("/devices/{device_id}/logs")
 async def list_device_logs(
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """List all debug logs for a device."""
     # Get device
@@ -631,8 +623,8 @@ async def list_device_logs(
 async def download_device_log(
     device_id: str,
     log_id: int,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Download a debug log file."""
     # Get device
@@ -676,8 +668,8 @@ async def download_device_log(
 async def delete_device_log(
     device_id: str,
     log_id: int,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete a debug log."""
     # Get device
@@ -726,8 +718,8 @@ async def delete_device_log(
 @router.put("/devices/{device_id}/set-offline")
 async def set_device_offline(
     device_id: str,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Manually mark a device as offline (admin only).
 
@@ -758,8 +750,8 @@ async def set_device_offline(
 
 @router.put("/devices/reset-all-offline")
 async def reset_all_devices_offline(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Mark all devices as offline (admin only).
 
@@ -11,8 +11,11 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from fastapi_users import exceptions
 
+from app.auth import current_admin, get_user_manager
+from app.database import get_db
 from app.models import User, Device, Plant, LoginHistory
 from app.schemas import UserCreate, UserUpdate, PasswordReset
+from app.utils.user_cache import invalidate_user
 
 router = APIRouter()
 
@@ -21,21 +24,6 @@ router = APIRouter()
 impersonation_sessions = {}
 
 
-def _get_current_admin():
-    from app.main import current_admin
-    return current_admin
-
-
-def _get_db():
-    from app.main import get_db
-    return get_db
-
-
-def _get_user_manager():
-    from app.main import get_user_manager
-    return get_user_manager
-
-
 def _get_templates():
     from app.main import templates
     return templates
@@ -46,7 +34,7 @@ def _get_templates():
 @router.get("/overview", response_class=HTMLResponse)
 async def admin_overview_page(
     request: Request,
-    admin: User = Depends(_get_current_admin())
+    admin: User = Depends(current_admin)
 ):
     """Admin overview page (legacy)"""
     return _get_templates().TemplateResponse("admin_overview.html", {"request": request, "user": admin})
@@ -55,8 +43,8 @@ async def admin_overview_page(
 @router.get("/portal", response_class=HTMLResponse)
 async def admin_portal_page(
     request: Request,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Admin Portal - User management and system control"""
     result = await session.execute(
@@ -83,8 +71,8 @@ async def admin_portal_page(
 
 @router.get("/user-count")
 async def get_user_count(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get total user count"""
     result = await session.execute(select(func.count(User.id)))
@@ -95,8 +83,8 @@ async def get_user_count(
 @router.post("/users")
 async def add_user(
     user_data: UserCreate,
-    admin: User = Depends(_get_current_admin()),
-    manager = Depends(_get_user_manager())
+    admin: User = Depends(current_admin),
+    manager = Depends(get_user_manager)
 ):
     """Create a new user"""
     try:
@@ -110,9 +98,9 @@ async def add_user(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    admin: User = Depends(_get_current_admin()),
-    manager = Depends(_get_user_manager()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    manager = Depends(get_user_manager),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update user information"""
     user = await manager.user_db.get(user_id)
@@ -132,6 +120,7 @@ async def update_user(
         update_dict["is_superuser"] = user_data.is_superuser
 
     user = await manager.user_db.update(user, update_dict)
+    invalidate_user(user_id)
     return {"status": "success"}
 
 
@@ -139,8 +128,8 @@ async def update_user(
 async def reset_password(
     user_id: int,
     password_reset: PasswordReset,
-    admin: User = Depends(_get_current_admin()),
-    manager = Depends(_get_user_manager())
+    admin: User = Depends(current_admin),
+    manager = Depends(get_user_manager)
 ):
     """Reset a user's password"""
     user = await manager.user_db.get(user_id)
@@ -149,14 +138,15 @@ async def reset_password(
     hashed_password = manager.password_helper.hash(password_reset.password)
     update_dict = {"hashed_password": hashed_password}
     user = await manager.user_db.update(user, update_dict)
+    invalidate_user(user_id)
     return {"status": "success"}
 
 
 @router.post("/users/{user_id}/suspend")
 async def suspend_user(
     user_id: int,
-    admin: User = Depends(_get_current_admin()),
-    manager = Depends(_get_user_manager())
+    admin: User = Depends(current_admin),
+    manager = Depends(get_user_manager)
 ):
     """Suspend a user"""
     user = await manager.user_db.get(user_id)
@@ -164,14 +154,15 @@ async def suspend_user(
         raise HTTPException(status_code=404, detail="User not found")
     update_dict = {"is_suspended": True}
     user = await manager.user_db.update(user, update_dict)
+    invalidate_user(user_id)
     return {"status": "success"}
 
 
 @router.post("/users/{user_id}/unsuspend")
 async def unsuspend_user(
     user_id: int,
-    admin: User = Depends(_get_current_admin()),
-    manager = Depends(_get_user_manager())
+    admin: User = Depends(current_admin),
+    manager = Depends(get_user_manager)
 ):
     """Unsuspend a user"""
     user = await manager.user_db.get(user_id)
@@ -179,14 +170,15 @@ async def unsuspend_user(
         raise HTTPException(status_code=404, detail="User not found")
     update_dict = {"is_suspended": False}
     user = await manager.user_db.update(user, update_dict)
+    invalidate_user(user_id)
     return {"status": "success"}
 
 
 @router.post("/users/{user_id}/approve")
 async def approve_user(
     user_id: int,
-    admin: User = Depends(_get_current_admin()),
-    manager = Depends(_get_user_manager())
+    admin: User = Depends(current_admin),
+    manager = Depends(get_user_manager)
 ):
     """Approve a pending user"""
     user = await manager.user_db.get(user_id)
@@ -194,20 +186,22 @@ async def approve_user(
         raise HTTPException(status_code=404, detail="User not found")
     update_dict = {"is_active": True}
     user = await manager.user_db.update(user, update_dict)
+    invalidate_user(user_id)
     return {"status": "success"}
 
 
 @router.delete("/users/{user_id}")
 async def delete_user_admin(
     user_id: int,
-    session: AsyncSession = Depends(_get_db()),
-    admin: User = Depends(_get_current_admin())
+    session: AsyncSession = Depends(get_db),
+    admin: User = Depends(current_admin)
 ):
     """Delete a user"""
     user = await session.get(User, user_id)
     if user:
         await session.delete(user)
         await session.commit()
+        invalidate_user(user_id)
         return {"status": "success"}
     raise HTTPException(404, "User not found")
 
@@ -215,37 +209,39 @@ async def delete_user_admin(
 # User counts API for the admin users table (must be before {user_id} route)
 @router.get("/api/users/counts")
 async def get_users_counts(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get device and plant counts for all users"""
-    # Get all users with their device and plant counts
-    users_result = await session.execute(select(User))
-    users = users_result.scalars().all()
-
-    counts = []
-    for user in users:
-        device_result = await session.execute(
-            select(func.count(Device.id)).where(Device.user_id == user.id)
-        )
-        plant_result = await session.execute(
-            select(func.count(Plant.id)).where(Plant.user_id == user.id)
-        )
+    # One grouped COUNT per table instead of two COUNT queries per user,
+    # and only user IDs are loaded (no full User rows)
+    device_result = await session.execute(
+        select(Device.user_id, func.count(Device.id)).group_by(Device.user_id)
+    )
+    device_counts = dict(device_result.all())
 
-        counts.append({
-            "id": user.id,
-            "device_count": device_result.scalar() or 0,
-            "plant_count": plant_result.scalar() or 0
-        })
+    plant_result = await session.execute(
+        select(Plant.user_id, func.count(Plant.id)).group_by(Plant.user_id)
+    )
+    plant_counts = dict(plant_result.all())
+
+    user_ids = (await session.execute(select(User.id).order_by(User.id))).scalars().all()
 
-    return counts
+    return [
+        {
+            "id": user_id,
+            "device_count": device_counts.get(user_id, 0),
+            "plant_count": plant_counts.get(user_id, 0)
+        }
+        for user_id in user_ids
+    ]
 
 
 # Active Sessions API (must be before {user_id} route)
 @router.get("/api/users/active-sessions")
 async def get_active_sessions(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get users who have logged in within the last hour"""
     one_hour_ago = datetime.utcnow() - timedelta(hours=1)
@@ -289,8 +285,8 @@ async def get_active_sessions(
 @router.get("/api/users/{user_id}")
 async def get_user_details(
     user_id: int,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get detailed user information"""
     user = await session.get(User, user_id)
@@ -326,8 +322,8 @@ async def get_user_details(
 @router.get("/api/users/{user_id}/login-history")
 async def get_user_login_history(
     user_id: int,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get user's login history and statistics"""
     user = await session.get(User, user_id)
@@ -362,8 +358,8 @@ async def get_user_login_history(
 @router.delete("/plants/{plant_id}", response_model=Dict[str, str])
 async def delete_plant_admin(
     plant_id: str,
-    user: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    user: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete a plant (admin only)"""
     result = await session.execute(
@@ -382,8 +378,8 @@ async def delete_plant_admin(
 
 @router.get("/all-plants")
 async def get_all_plants(
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all plants in the system"""
     result = await session.execute(
@@ -417,7 +413,7 @@ async def get_all_plants(
 async def exit_impersonation(
     request: Request,
     response: Response,
-    admin: User = Depends(_get_current_admin())
+    admin: User = Depends(current_admin)
 ):
     """Exit impersonation mode"""
     # Remove from in-memory store
@@ -435,8 +431,8 @@ async def exit_impersonation(
 @router.get("/impersonate/status")
 async def get_impersonation_status(
     request: Request,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Check if currently impersonating a user"""
     impersonated_id = request.cookies.get("impersonate_user_id")
@@ -463,8 +459,8 @@ async def start_impersonation(
     user_id: int,
     request: Request,
     response: Response,
-    admin: User = Depends(_get_current_admin()),
-    session: AsyncSession = Depends(_get_db())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Start impersonating a user - admin can view as this user"""
     # Verify target user exists
@@ -9,6 +9,8 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.auth import current_user, get_jwt_strategy, get_user_manager, google_oauth_client
+from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate
 from app.utils.login_tracker import record_login
@@ -19,36 +21,6 @@ api_router = APIRouter(prefix="/api/user", tags=["user-api"])
 templates = Jinja2Templates(directory="templates")
 
 
-def get_current_user_dependency():
-    """Import and return current_user dependency"""
-    from app.main import current_user
-    return current_user
-
-
-def get_db_dependency():
-    """Import and return get_db dependency"""
-    from app.main import get_db
-    return get_db
-
-
-def get_user_manager_dependency():
-    """Import and return get_user_manager dependency"""
-    from app.main import get_user_manager
-    return get_user_manager
-
-
-def get_jwt_strategy_dependency():
-    """Import and return get_jwt_strategy dependency"""
-    from app.main import get_jwt_strategy
-    return get_jwt_strategy
-
-
-def get_google_oauth_client():
-    """Import and return google_oauth_client"""
-    from app.main import google_oauth_client
-    return google_oauth_client
-
-
 def get_client_ip(request: Request) -> str:
     """Extract client IP address from request, prioritizing public IPs."""
     import ipaddress
@@ -94,7 +66,6 @@ def get_user_agent(request: Request) -> str:
 # Google OAuth authorize
 @router.get("/auth/google/authorize", response_model=dict)
 async def google_authorize_custom(request: Request):
-    google_oauth_client = get_google_oauth_client()
     redirect_uri = request.url_for("auth:google.callback")
     auth_url = await google_oauth_client.get_authorization_url(
         str(redirect_uri),
@@ -110,11 +81,10 @@ async def google_callback_custom(
     request: Request,
     code: str,
     state: str = None,
-    manager = Depends(get_user_manager_dependency()),
-    strategy = Depends(get_jwt_strategy_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    manager = Depends(get_user_manager),
+    strategy = Depends(get_jwt_strategy),
+    session: AsyncSession = Depends(get_db)
 ):
-    google_oauth_client = get_google_oauth_client()
     try:
         # Get OAuth token
         token = await google_oauth_client.get_access_token(code, request.url_for("auth:google.callback"))
@@ -135,6 +105,8 @@ async def google_callback_custom(
             associate_by_email=True,
             is_verified_by_default=False,
         )
+        # oauth_callback only flushes the OAuth account link; commit it here in one go
+        await session.commit()
 
         print(f"OAuth callback returned user: {user.email}, is_active={user.is_active}, is_suspended={getattr(user, 'is_suspended', None)}")
 
@@ -215,7 +187,7 @@ async def register_user(
     password: str = Form(...),
     first_name: str = Form(...),
     last_name: str = Form(...),
-    manager = Depends(get_user_manager_dependency())
+    manager = Depends(get_user_manager)
 ):
     from fastapi_users import exceptions
     try:
@@ -250,9 +222,9 @@ async def login(
     password: str = Form(...),
     next: str = Form(None),
     device_id: str = Form(None),
-    manager = Depends(get_user_manager_dependency()),
-    strategy = Depends(get_jwt_strategy_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    manager = Depends(get_user_manager),
+    strategy = Depends(get_jwt_strategy),
+    session: AsyncSession = Depends(get_db)
 ):
     from fastapi.security import OAuth2PasswordRequestForm
 
@@ -318,9 +290,9 @@ async def api_login(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
-    manager = Depends(get_user_manager_dependency()),
-    strategy = Depends(get_jwt_strategy_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    manager = Depends(get_user_manager),
+    strategy = Depends(get_jwt_strategy),
+    session: AsyncSession = Depends(get_db)
 ):
     from fastapi.responses import JSONResponse
     from fastapi.security import OAuth2PasswordRequestForm
@@ -375,8 +347,8 @@ async def api_login(
 @api_router.get("/me")
 async def get_current_user_info(
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     # Check for impersonation - return impersonated user's info if active
     effective_user = user
@@ -407,8 +379,8 @@ async def get_current_user_info(
 # Get dashboard preferences
 @api_router.get("/dashboard-preferences")
 async def get_dashboard_preferences(
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     # Refresh user from database to get latest preferences
     result = await session.execute(select(User).where(User.id == user.id))
@@ -427,8 +399,8 @@ async def get_dashboard_preferences(
 @api_router.post("/dashboard-preferences")
 async def save_dashboard_preferences(
     preferences: Dict[str, Any],
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     import json
 
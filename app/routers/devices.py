@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 import secrets
 
+from app.auth import current_user
+from app.database import get_db
 from app.models import User, Device, DeviceShare, DeviceLink, DeviceConnection, Plant, DeviceAssignment, Location, DeviceDebugLog
 
 # Log storage directory
@@ -37,18 +39,6 @@ router = APIRouter(prefix="/user/devices", tags=["devices"])
 api_router = APIRouter(prefix="/api/devices", tags=["devices-api"])
 
 
-def get_current_user_dependency():
-    """Import and return current_user dependency"""
-    from app.main import current_user
-    return current_user
-
-
-def get_db_dependency():
-    """Import and return get_db dependency"""
-    from app.main import get_db
-    return get_db
-
-
 async def get_effective_user(
     request: Request,
     user: User,
@@ -97,8 +87,8 @@ async def generate_share_code(session: AsyncSession) -> str:
 async def add_device(
     request: Request,
     device: DeviceCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Add a new device"""
     # Get effective user (handles impersonation)
@@ -145,8 +135,8 @@ async def add_device(
 @router.get("", response_model=List[DeviceRead])
 async def list_devices(
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """List all devices owned by or shared with the user"""
     # Get effective user (handles impersonation)
@@ -341,8 +331,8 @@ async def list_devices(
 async def update_device(
     device_id: str,
     device_update: DeviceUpdate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update device information"""
     result = await session.execute(select(Device).where(Device.device_id == device_id, Device.user_id == user.id))
@@ -431,8 +421,8 @@ async def update_device(
 @router.delete("/{device_id}")
 async def delete_device(
     device_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete a device and all related records"""
     from app.models import DeviceShare, DeviceLink, DeviceDebugLog, DeviceFirmwareAssignment
@@ -467,8 +457,8 @@ async def delete_device(
 @router.get("/{device_id}/plants")
 async def get_device_plants(
     device_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all plants assigned to a device"""
     # Verify device exists and user has access
@@ -521,8 +511,8 @@ async def get_device_plants(
 async def create_device_share(
     device_id: str,
     share_data: ShareCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a share code for a device"""
     # Verify user owns the device
@@ -560,8 +550,8 @@ async def create_device_share(
 @router.post("/accept-share", response_model=Dict[str, str])
 async def accept_device_share(
     share_data: ShareAccept,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Accept a device share using a share code"""
     # Find the share by code
@@ -604,8 +594,8 @@ async def accept_device_share(
 @router.get("/{device_id}/shares", response_model=List[ShareRead])
 async def list_device_shares(
     device_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """List all shares for a device (owner only)"""
     # Verify ownership
@@ -649,8 +639,8 @@ async def list_device_shares(
 @router.delete("/shares/{share_id}")
 async def revoke_device_share(
     share_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Revoke a device share"""
     # Verify ownership and get share
@@ -678,8 +668,8 @@ async def revoke_device_share(
 async def update_device_share_permission(
     share_id: int,
     share_data: ShareUpdate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update the permission level of a device share"""
     # Validate permission level
@@ -711,8 +701,8 @@ async def update_device_share_permission(
 @router.get("/{device_id}/available-links", response_model=List[AvailableDeviceForLinking])
 async def get_available_devices_for_linking(
     device_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Get devices that can be linked to a feeding system.
@@ -767,8 +757,8 @@ async def get_available_devices_for_linking(
 @router.get("/{device_id}/links", response_model=List[DeviceLinkRead])
 async def get_device_links(
     device_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all devices linked to a feeding system"""
     # Verify user owns the device
@@ -808,8 +798,8 @@ async def get_device_links(
 async def create_device_link(
     device_id: str,
     link_data: DeviceLinkCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Link an environmental sensor or valve controller to a feeding system"""
     # Validate link type
@@ -882,8 +872,8 @@ async def create_device_link(
 async def delete_device_link(
     device_id: str,
     link_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Remove a device link"""
     # Verify user owns the parent device
@@ -921,8 +911,8 @@ async def delete_device_link(
 async def get_device_connections(
     device_id: str,
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all active connections for a device (both outgoing and incoming)."""
     effective_user = await get_effective_user(request, user, session)
@@ -987,8 +977,8 @@ async def create_device_connection(
     device_id: str,
     connection: DeviceConnectionCreate,
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a new connection from this device to another device."""
     effective_user = await get_effective_user(request, user, session)
@@ -1061,8 +1051,8 @@ async def update_device_connection(
     connection_id: int,
     connection_update: DeviceConnectionUpdate,
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update a device connection's configuration."""
     effective_user = await get_effective_user(request, user, session)
@@ -1123,8 +1113,8 @@ async def delete_device_connection(
     device_id: str,
     connection_id: int,
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Soft-delete a device connection."""
     effective_user = await get_effective_user(request, user, session)
@@ -1160,8 +1150,8 @@ async def delete_device_connection(
 async def pair_device(
     request: Request,
     pair_request: DevicePairRequest,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Pair an environment sensor device to a user account.
@@ -1297,7 +1287,7 @@ async def pair_status_options(device_id: str):
 @api_router.get("/check-registration")
 async def check_device_registration(
     device_id: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Check if a device is registered on the server by its device_id.
@@ -1327,7 +1317,7 @@ async def check_device_registration(
 async def unpair_device(
     device_id: str,
     api_key: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Device requests to unpair itself from the server.
@@ -1357,7 +1347,7 @@ async def upload_debug_log(
     log_id: int = Query(...),
     actual_duration: int = Query(...),
     early_cutoff_reason: str = Query(None),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Device uploads a debug log file after capture completes.
@@ -1419,7 +1409,7 @@ async def update_log_status(
     api_key: str = Query(...),
     log_id: int = Query(...),
     status: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Device updates the status of a log capture (e.g., started capturing, failed).
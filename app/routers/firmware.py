@@ -12,6 +12,8 @@ from fastapi.responses import HTMLResponse, FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
+from app.auth import current_admin, current_user
+from app.database import get_db
 from app.models import User, Device, Firmware, DeviceFirmwareAssignment
 from app.schemas import (
     FirmwareRead,
@@ -40,24 +42,6 @@ def is_version_newer(latest_version: str, current_version: str) -> bool:
         return latest_version > current_version
 
 
-def get_current_admin_dependency():
-    """Import and return current_admin dependency"""
-    from app.main import current_admin
-    return current_admin
-
-
-def get_current_user_dependency():
-    """Import and return current_user dependency"""
-    from app.main import current_user
-    return current_user
-
-
-def get_db_dependency():
-    """Import and return get_db dependency"""
-    from app.main import get_db
-    return get_db
-
-
 def get_templates():
     """Import and return templates"""
     from app.main import templates
@@ -96,8 +80,8 @@ def calculate_checksum(file_path: str) -> str:
 @router.get("/admin/firmware", response_class=HTMLResponse)
 async def firmware_management_page(
     request: Request,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Firmware management page (admin only)"""
     from sqlalchemy import func
@@ -120,8 +104,8 @@ async def firmware_management_page(
 
 @router.get("/admin/firmware/list", response_model=List[FirmwareListItem])
 async def list_all_firmware(
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency()),
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db),
     device_type: Optional[str] = None
 ):
     """List all firmware versions, optionally filtered by device type"""
@@ -141,8 +125,8 @@ async def list_all_firmware(
 
 @router.get("/admin/firmware/assignments", response_model=List[DeviceFirmwareAssignmentRead])
 async def list_firmware_assignments(
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """List all device-specific firmware assignments"""
     result = await session.execute(
@@ -178,8 +162,8 @@ async def create_firmware_assignment(
     firmware_id: int = Form(...),
     force_update: bool = Form(False),
     notes: str = Form(None),
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Assign a specific firmware version to a device.
@@ -271,8 +255,8 @@ async def create_firmware_assignment(
 async def set_force_update(
     assignment_id: int,
     force: bool = True,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Set or clear the force_update flag on a device assignment"""
     result = await session.execute(
@@ -303,8 +287,8 @@ async def set_force_update(
 @router.delete("/admin/firmware/assignments/{assignment_id}")
 async def delete_firmware_assignment(
     assignment_id: int,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Remove a device-specific firmware assignment.
@@ -329,8 +313,8 @@ async def delete_firmware_assignment(
 @router.get("/admin/firmware/{firmware_id}", response_model=FirmwareRead)
 async def get_firmware_details(
     firmware_id: int,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get detailed firmware information including release notes"""
     result = await session.execute(
@@ -352,8 +336,8 @@ async def upload_firmware(
     is_prerelease: bool = Form(False),
     set_as_latest: bool = Form(False),
     file: UploadFile = File(...),
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Upload a new firmware binary.
@@ -443,8 +427,8 @@ async def upload_firmware(
 @router.put("/admin/firmware/{firmware_id}/set-latest")
 async def set_firmware_as_latest(
     firmware_id: int,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Mark a firmware version as the latest stable release for its device type"""
     result = await session.execute(
@@ -478,8 +462,8 @@ async def set_firmware_as_latest(
 async def update_release_notes(
     firmware_id: int,
     release_notes: str = Form(...),
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update the release notes for a firmware version"""
     result = await session.execute(
@@ -499,8 +483,8 @@ async def update_release_notes(
 @router.delete("/admin/firmware/{firmware_id}")
 async def delete_firmware(
     firmware_id: int,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete a firmware version (removes file and database record)"""
     result = await session.execute(
@@ -539,8 +523,8 @@ async def delete_firmware(
 @router.put("/admin/devices/{device_id}/force-firmware-update")
 async def force_device_firmware_update(
     device_id: str,
-    admin: User = Depends(get_current_admin_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    admin: User = Depends(current_admin),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Force a device to update on its next heartbeat.
@@ -621,7 +605,7 @@ async def force_device_firmware_update(
 async def download_firmware(
     device_type: str,
     version: str,
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Download a firmware binary.
@@ -663,7 +647,7 @@ async def download_firmware(
 async def check_firmware_update(
     device_id: str,
     current_version: str,
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ) -> FirmwareUpdateInfo:
     """
     Check if a firmware update is available for a device.
@@ -766,8 +750,8 @@ async def check_firmware_update(
 async def get_release_notes(
     device_type: str,
     version: Optional[str] = None,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Get release notes for a firmware version.
@@ -807,8 +791,8 @@ async def get_release_notes(
 @router.get("/api/firmware/{device_type}/changelog")
 async def get_changelog(
     device_type: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency()),
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db),
     limit: int = 10
 ):
     """
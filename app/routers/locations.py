@@ -8,6 +8,8 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 
+from app.auth import current_user
+from app.database import get_db
 from app.models import User, Location, LocationShare
 from app.schemas import (
     LocationCreate,
@@ -22,18 +24,6 @@ from app.schemas import (
 router = APIRouter(prefix="/user/locations", tags=["locations"])
 
 
-def get_current_user_dependency():
-    """Import and return current_user dependency"""
-    from app.main import current_user
-    return current_user
-
-
-def get_db_dependency():
-    """Import and return get_db dependency"""
-    from app.main import get_db
-    return get_db
-
-
 async def get_effective_user(
     request: Request,
     user: User,
@@ -77,8 +67,8 @@ async def generate_share_code(session: AsyncSession) -> str:
 async def create_location(
     request: Request,
     location: LocationCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a new location"""
     # Get effective user (handles impersonation)
@@ -116,8 +106,8 @@ async def create_location(
 @router.get("", response_model=List[LocationRead])
 async def list_locations(
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """List all locations owned by or shared with the user"""
     # Get effective user (handles impersonation)
@@ -185,8 +175,8 @@ async def list_locations(
 @router.get("/{location_id}", response_model=LocationRead)
 async def get_location(
     location_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get a specific location by ID"""
     result = await session.execute(select(Location).where(Location.id == location_id))
@@ -245,8 +235,8 @@ async def update_location(
     request: Request,
     location_id: int,
     location_update: LocationUpdate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update a location"""
     # Get effective user (handles impersonation)
@@ -294,8 +284,8 @@ async def update_location(
 async def delete_location(
     request: Request,
     location_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete a location"""
     # Get effective user (handles impersonation)
@@ -330,8 +320,8 @@ async def delete_location(
 async def create_location_share(
     location_id: int,
     share_data: LocationShareCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a share code for a location"""
     # Verify user owns the location
@@ -369,8 +359,8 @@ async def create_location_share(
 @router.post("/accept-share", response_model=Dict[str, str])
 async def accept_location_share(
     share_data: ShareAccept,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Accept a location share using a share code"""
     # Find the share by code
@@ -413,8 +403,8 @@ async def accept_location_share(
 @router.get("/{location_id}/shares", response_model=List[LocationShareRead])
 async def list_location_shares(
     location_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """List all shares for a location (owner only)"""
     # Verify ownership
@@ -459,8 +449,8 @@ async def list_location_shares(
 async def revoke_location_share(
     location_id: int,
     share_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Revoke a location share"""
     # Verify ownership and get share
@@ -490,8 +480,8 @@ async def update_location_share_permission(
     location_id: int,
     share_id: int,
     share_data: ShareUpdate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update the permission level of a location share"""
     # Validate permission level
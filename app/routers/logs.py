@@ -11,6 +11,8 @@ from dateutil import parser as date_parser
 from pydantic import Field
 import json
 
+from app.auth import current_user
+from app.database import get_db
 from app.models import (
     User, Device, Plant, PlantDailyLog, DeviceAssignment, DeviceShare,
     Firmware, DeviceFirmwareAssignment, DeviceDebugLog, Location, DosingEvent, LightEvent,
@@ -40,18 +42,6 @@ router = APIRouter(tags=["logs"])
 environment_cache: Dict[str, Dict] = {}
 
 
-def get_db_dependency():
-    """Lazy import to avoid circular imports"""
-    from app.main import get_db
-    return get_db
-
-
-def get_current_user_dependency():
-    """Lazy import to avoid circular imports"""
-    from app.main import current_user
-    return current_user
-
-
 async def get_effective_user(
     request: Request,
     user: User,
@@ -183,7 +173,7 @@ async def log_hydro_readings(
     device_id: str,
     reading: HydroReadingCreate,
     api_key: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Hydro controller posts sensor readings (4x per day).
@@ -368,7 +358,7 @@ async def environment_heartbeat(
     device_id: str,
     data: EnvironmentDataCreate,
     api_key: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Environment sensor heartbeat - updates device status and returns settings.
@@ -527,8 +517,8 @@ async def environment_heartbeat(
 async def get_plant_logs(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency()),
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db),
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     limit: int = 365
@@ -671,8 +661,8 @@ async def get_plant_logs(
 async def get_plant_dosing_events(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency()),
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db),
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     limit: int = 1000
@@ -748,8 +738,8 @@ async def get_plant_dosing_events(
 @router.get("/api/devices/{device_id}/environment/latest")
 async def get_latest_environment_data(
     device_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get the latest environment sensor reading from cache."""
     # Verify device exists and user has access
@@ -824,7 +814,7 @@ async def update_device_settings(
     device_id: str,
     settings_update: DeviceSettingsUpdate,
     api_key: str = Header(..., alias="X-API-Key"),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """Update device settings (temperature unit, update interval, log interval, etc.)"""
     # Verify device exists and API key matches
@@ -877,7 +867,7 @@ async def receive_daily_report(
     device_id: str,
     report: Annotated[Union[EnvironmentDailyReport, HydroDailyReport], Field(discriminator='report_type')],
     api_key: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Receive daily aggregated report from device.
@@ -9,6 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete, and_, or_, func
 import time
 
+from app.auth import current_user
+from app.database import get_db
 from app.models import User, Device, Notification, NotificationSeverity, NotificationStatus, DeviceShare
 from app.schemas.notification import (
     NotificationRead,
@@ -21,18 +23,6 @@ from app.schemas.notification import (
 router = APIRouter(tags=["notifications"])
 
 
-def get_db_dependency():
-    """Lazy import to avoid circular imports"""
-    from app.main import get_db
-    return get_db
-
-
-def get_current_user_dependency():
-    """Lazy import to avoid circular imports"""
-    from app.main import current_user
-    return current_user
-
-
 async def get_effective_user(
     request: Request,
     user: User,
@@ -93,8 +83,8 @@ async def get_notifications(
     active_only: bool = Query(False, description="Only return active notifications"),
     limit: int = Query(100, le=500, description="Maximum number of notifications to return"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Get notifications for user's devices.
@@ -198,8 +188,8 @@ async def get_notifications(
 async def get_notifications_summary(
     request: Request,
     device_id: Optional[str] = Query(None, description="Filter by device ID"),
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Get summary of notification counts for user's devices.
@@ -290,8 +280,8 @@ async def get_notifications_summary(
 async def clear_notification(
     notification_id: int,
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     User clears a specific notification.
@@ -339,8 +329,8 @@ async def clear_notification(
 async def clear_all_notifications(
     request: Request,
     device_id: Optional[str] = Query(None, description="Clear all for specific device, or all devices if not specified"),
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     User clears all active notifications.
@@ -410,8 +400,8 @@ async def clear_all_notifications(
 async def remove_cleared_notifications(
     request: Request,
     device_id: Optional[str] = Query(None, description="Remove cleared for specific device, or all devices if not specified"),
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     User endpoint to remove cleared notifications.
@@ -482,8 +472,8 @@ async def remove_cleared_notifications(
 
 @router.delete("/notifications/cleanup")
 async def cleanup_old_notifications(
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Admin endpoint to manually trigger cleanup of old cleared notifications.
@@ -2,42 +2,47 @@
 """
 HTML page routes for the web application.
 """
+from contextlib import suppress
 from datetime import datetime
+from typing import Optional
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 import jwt
 
+from app.auth import SECRET, current_user
+from app.dependencies import get_optional_user
 from app.models import User
+from app.utils.user_cache import CachedUser
 
 router = APIRouter(tags=["pages"])
 print("[DEBUG] pages.py router initialized")
 
 templates = Jinja2Templates(directory="templates")
 
-# Temporary storage for pending device pairings (device_id -> device_info)
-# This avoids sessionStorage issues when redirecting to login
-pending_pairings = {}
+# Expected failures when resolving the optional user from the auth cookie
+# (bad/expired token, malformed subject, DB hiccup); anything else propagates
+_OPTIONAL_AUTH_ERRORS = (jwt.PyJWTError, ValueError, SQLAlchemyError)
 
 
-def get_current_user_dependency():
-    """Import and return current_user dependency"""
-    from app.main import current_user
-    return current_user
+async def _get_page_user(request: Request) -> Optional[CachedUser]:
+    """Cached snapshot of the signed-in user, or None when anonymous or the token/lookup fails."""
+    with suppress(*_OPTIONAL_AUTH_ERRORS):
+        return await get_optional_user(request, request.state.db)
+    return None
 
 
-def get_secret():
-    """Import and return SECRET"""
-    from app.main import SECRET
-    return SECRET
+def _can_use_app(user: Optional[CachedUser]) -> bool:
+    """Same gate as current_user: signed in, approved and not suspended."""
+    return user is not None and user.is_active and not user.is_suspended
 
 
-def get_async_session_maker():
-    """Import and return async_session_maker"""
-    from app.main import async_session_maker
-    return async_session_maker
+# Temporary storage for pending device pairings (device_id -> device_info)
+# This avoids sessionStorage issues when redirecting to login
+pending_pairings = {}
 
 
 # Landing page - redirects to discover page (public social features) or dashboard if authenticated
@@ -51,54 +56,49 @@ async def root(request: Request):
         return RedirectResponse("/social/discover")
 
     # Try to decode token and get user
-    try:
-        async_session_maker = get_async_session_maker()
-        SECRET = get_secret()
-
-        async with async_session_maker() as session:
-            payload = jwt.decode(
-                cookie,
-                SECRET,
-                algorithms=["HS256"],
-                options={"verify_aud": False}
-            )
-            user_id = payload.get("sub")
-
-            if user_id:
-                user_id = int(user_id)
-                result = await session.execute(select(User).where(User.id == user_id))
-                user = result.scalars().first()
-
-                if user:
-                    # Check if user is suspended (handle None as False)
-                    is_suspended = getattr(user, 'is_suspended', None)
-                    is_active = user.is_active
-
-                    print(f"Root route check for {user.email}: is_suspended={is_suspended}, is_active={is_active}")
-
-                    # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
-                    if is_suspended is None or is_suspended is False or is_suspended == 0:
-                        is_suspended = False
-                    else:
-                        is_suspended = True
-
-                    if is_suspended:
-                        print(f"Root route: {user.email} is SUSPENDED - showing suspended page")
-                        response = templates.TemplateResponse("suspended.html", {"request": request}, status_code=403)
-                        response.delete_cookie("auth_cookie")
-                        return response
-
-                    # Check if user is pending approval
-                    if not is_active:
-                        print(f"Root route: {user.email} is PENDING - showing pending approval page")
-                        response = templates.TemplateResponse("pending_approval.html", {"request": request}, status_code=403)
-                        response.delete_cookie("auth_cookie")
-                        return response
-
-                    # User is active and not suspended - redirect to dashboard
-                    return RedirectResponse("/dashboard")
-    except:
-        pass
+    with suppress(*_OPTIONAL_AUTH_ERRORS):
+        session = request.state.db  # request-scoped session from DBSessionMiddleware
+        payload = jwt.decode(
+            cookie,
+            SECRET,
+            algorithms=["HS256"],
+            options={"verify_aud": False}
+        )
+        user_id = payload.get("sub")
+
+        if user_id:
+            user_id = int(user_id)
+            result = await session.execute(select(User).where(User.id == user_id))
+            user = result.scalars().first()
+
+            if user:
+                # Check if user is suspended (handle None as False)
+                is_suspended = getattr(user, 'is_suspended', None)
+                is_active = user.is_active
+
+                print(f"Root route check for {user.email}: is_suspended={is_suspended}, is_active={is_active}")
+
+                # Normalize is_suspended to boolean (handle None, 0, 1, True, False)
+                if is_suspended is None or is_suspended is False or is_suspended == 0:
+                    is_suspended = False
+                else:
+                    is_suspended = True
+
+                if is_suspended:
+                    print(f"Root route: {user.email} is SUSPENDED - showing suspended page")
+                    response = templates.TemplateResponse("suspended.html", {"request": request}, status_code=403)
+                    response.delete_cookie("auth_cookie")
+                    return response
+
+                # Check if user is pending approval
+                if not is_active:
+                    print(f"Root route: {user.email} is PENDING - showing pending approval page")
+                    response = templates.TemplateResponse("pending_approval.html", {"request": request}, status_code=403)
+                    response.delete_cookie("auth_cookie")
+                    return response
+
+                # User is active and not suspended - redirect to dashboard
+                return RedirectResponse("/dashboard")
 
     # If anything fails, show public discover page
     return RedirectResponse("/social/discover")
@@ -150,22 +150,14 @@ async def device_pair_initiation(request: Request):
     }
 
     # Check if user is already authenticated
-    try:
-        auth_cookie = request.cookies.get("auth_cookie")
-        if auth_cookie:
-            try:
-                current_user = get_current_user_dependency()
-                user = await current_user(request)
-                # User is authenticated - show pairing page directly
-                return templates.TemplateResponse("device_pair.html", {
-                    "request": request,
-                    "user": user,
-                    "device_info": pending_pairings[device_id]
-                })
-            except:
-                pass
-    except:
-        pass
+    user = await _get_page_user(request)
+    if _can_use_app(user):
+        # User is authenticated - show pairing page directly
+        return templates.TemplateResponse("device_pair.html", {
+            "request": request,
+            "user": user,
+            "device_info": pending_pairings[device_id]
+        })
 
     # Not authenticated - redirect to login with device_id in URL
     return RedirectResponse(url=f"/login?next=/pair-device-auth&device_id={device_id}", status_code=302)
@@ -173,7 +165,7 @@ async def device_pair_initiation(request: Request):
 
 # Device pairing page (requires authentication) - legacy route
 @router.get("/pair-device-auth", response_class=HTMLResponse)
-async def device_pair_page(request: Request, user: User = Depends(get_current_user_dependency())):
+async def device_pair_page(request: Request, user: User = Depends(current_user)):
     """Device pairing page for environment sensors - requires authentication"""
     device_id = request.query_params.get('device_id')
 
@@ -210,18 +202,7 @@ async def device_pair_standalone(request: Request):
         })
 
     # Check if user is authenticated (should be after OAuth)
-    is_authenticated = False
-    try:
-        auth_cookie = request.cookies.get("auth_cookie")
-        if auth_cookie:
-            try:
-                current_user = get_current_user_dependency()
-                user = await current_user(request)
-                is_authenticated = True
-            except:
-                pass
-    except:
-        pass
+    is_authenticated = _can_use_app(await _get_page_user(request))
 
     device_info = pending_pairings[device_id]
     device_info_for_template = {k: v for k, v in device_info.items() if k != 'timestamp'}
@@ -235,7 +216,7 @@ async def device_pair_standalone(request: Request):
 
 # Dashboard
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request, user: User = Depends(get_current_user_dependency())):
+async def dashboard(request: Request, user: User = Depends(current_user)):
     # Check for impersonation mode (admin viewing as another user)
     impersonating_user = None
     display_user = user  # The user whose data to display
@@ -244,16 +225,12 @@ async def dashboard(request: Request, user: User = Depends(get_current_user_depe
         impersonated_id = request.cookies.get("impersonate_user_id")
         if impersonated_id:
             try:
-                from app.main import get_db
-                from sqlalchemy.ext.asyncio import AsyncSession
-
-                # Get impersonated user from database
-                async for session in get_db():
-                    target = await session.get(User, int(impersonated_id))
-                    if target:
-                        impersonating_user = target  # The user being impersonated
-                        display_user = target  # Show their data
-                    break
+                # Get impersonated user from the request's database session
+                session = request.state.db
+                target = await session.get(User, int(impersonated_id))
+                if target:
+                    impersonating_user = target  # The user being impersonated
+                    display_user = target  # Show their data
             except Exception as e:
                 print(f"Error loading impersonated user: {e}")
 
@@ -278,14 +255,11 @@ async def get_impersonation_context(request: Request, user: User) -> dict:
         impersonated_id = request.cookies.get("impersonate_user_id")
         if impersonated_id:
             try:
-                from app.main import get_db
-
-                async for session in get_db():
-                    target = await session.get(User, int(impersonated_id))
-                    if target:
-                        context["impersonating_user"] = target
-                        context["user"] = target  # Display as impersonated user
-                    break
+                session = request.state.db
+                target = await session.get(User, int(impersonated_id))
+                if target:
+                    context["impersonating_user"] = target
+                    context["user"] = target  # Display as impersonated user
             except Exception as e:
                 print(f"Error loading impersonated user: {e}")
 
@@ -294,28 +268,28 @@ async def get_impersonation_context(request: Request, user: User) -> dict:
 
 # Devices page
 @router.get("/devices", response_class=HTMLResponse)
-async def devices_page(request: Request, user: User = Depends(get_current_user_dependency())):
+async def devices_page(request: Request, user: User = Depends(current_user)):
     context = await get_impersonation_context(request, user)
     return templates.TemplateResponse("devices.html", {"request": request, **context})
 
 
 # Plants page
 @router.get("/plants", response_class=HTMLResponse)
-async def plants_page(request: Request, user: User = Depends(get_current_user_dependency())):
+async def plants_page(request: Request, user: User = Depends(current_user)):
     context = await get_impersonation_context(request, user)
     return templates.TemplateResponse("plants.html", {"request": request, **context})
 
 
 # Locations page
 @router.get("/locations", response_class=HTMLResponse)
-async def locations_page(request: Request, user: User = Depends(get_current_user_dependency())):
+async def locations_page(request: Request, user: User = Depends(current_user)):
     context = await get_impersonation_context(request, user)
     return templates.TemplateResponse("locations.html", {"request": request, **context})
 
 
 # Templates page
 @router.get("/templates", response_class=HTMLResponse)
-async def templates_page_route(request: Request, user: User = Depends(get_current_user_dependency())):
+async def templates_page_route(request: Request, user: User = Depends(current_user)):
     context = await get_impersonation_context(request, user)
     return templates.TemplateResponse("templates.html", {"request": request, **context})
 
@@ -331,19 +305,10 @@ async def discover_page(request: Request):
 
     # Try to get user if authenticated
     if cookie:
-        try:
-            async_session_maker = get_async_session_maker()
-            SECRET = get_secret()
-            async with async_session_maker() as session:
-                payload = jwt.decode(cookie, SECRET, algorithms=["HS256"])
-                user_id = payload.get("user_id")
-                result = await session.execute(select(User).where(User.id == user_id))
-                user = result.scalars().first()
-                if user:
-                    context["current_user"] = user
-                    context["is_superuser"] = user.is_superuser
-        except:
-            pass
+        user = await _get_page_user(request)
+        if user:
+            context["current_user"] = user
+            context["is_superuser"] = user.is_superuser
 
     return templates.TemplateResponse("social/discover.html", context)
 
@@ -351,7 +316,7 @@ print("[DEBUG] /social/discover route registered")
 
 # My profile page (authenticated) - MUST come before {user_id} route
 @router.get("/social/profile/me", response_class=HTMLResponse)
-async def my_profile_page(request: Request, user: User = Depends(get_current_user_dependency())):
+async def my_profile_page(request: Request, user: User = Depends(current_user)):
     context = await get_impersonation_context(request, user)
     context["user_id"] = user.id
     context["is_own_profile"] = True
@@ -366,19 +331,10 @@ async def profile_page(request: Request, user_id: int):
 
     # Try to get current user if authenticated
     if cookie:
-        try:
-            async_session_maker = get_async_session_maker()
-            SECRET = get_secret()
-            async with async_session_maker() as session:
-                payload = jwt.decode(cookie, SECRET, algorithms=["HS256"])
-                current_user_id = payload.get("user_id")
-                result = await session.execute(select(User).where(User.id == current_user_id))
-                user = result.scalars().first()
-                if user:
-                    context["current_user"] = user
-                    context["is_own_profile"] = (current_user_id == user_id)
-        except:
-            pass
+        user = await _get_page_user(request)
+        if user:
+            context["current_user"] = user
+            context["is_own_profile"] = (user.id == user_id)
 
     return templates.TemplateResponse("social/profile.html", context)
 
@@ -391,25 +347,16 @@ async def report_view_page(request: Request, report_id: int):
 
     # Try to get user if authenticated
     if cookie:
-        try:
-            async_session_maker = get_async_session_maker()
-            SECRET = get_secret()
-            async with async_session_maker() as session:
-                payload = jwt.decode(cookie, SECRET, algorithms=["HS256"])
-                user_id = payload.get("user_id")
-                result = await session.execute(select(User).where(User.id == user_id))
-                user = result.scalars().first()
-                if user:
-                    context["current_user"] = user
-        except:
-            pass
+        user = await _get_page_user(request)
+        if user:
+            context["current_user"] = user
 
     return templates.TemplateResponse("social/report_view.html", context)
 
 
 # Admin settings page (redirects to admin portal settings tab)
 @router.get("/admin/settings", response_class=HTMLResponse)
-async def admin_settings_page(request: Request, user: User = Depends(get_current_user_dependency())):
+async def admin_settings_page(request: Request, user: User = Depends(current_user)):
     if not user.is_superuser:
         return RedirectResponse("/dashboard")
 
@@ -9,6 +9,8 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 
+from app.auth import current_user
+from app.database import get_db
 from app.models import User, Device, Plant, DeviceAssignment, PhaseHistory, PhaseTemplate, DeviceShare, PlantReport
 from app.services.reports import generate_plant_report, get_live_plant_report
 from app.schemas import (
@@ -23,18 +25,6 @@ router = APIRouter(prefix="/user/plants", tags=["plants"])
 api_router = APIRouter(prefix="/api/devices", tags=["plants-api"])
 
 
-def get_current_user_dependency():
-    """Import and return current_user dependency"""
-    from app.main import current_user
-    return current_user
-
-
-def get_db_dependency():
-    """Import and return get_db dependency"""
-    from app.main import get_db
-    return get_db
-
-
 async def get_effective_user(
     request: Request,
     user: User,
@@ -62,8 +52,8 @@ async def get_effective_user(
 @router.post("", response_model=Dict[str, str])
 async def create_plant(
     plant_data: PlantCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a plant with device assignment (legacy endpoint)"""
     # Verify device exists and user has access (owns or has controller permission)
@@ -127,8 +117,8 @@ async def create_plant(
 async def create_plant_new(
     request: Request,
     plant_data: PlantCreateNew,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a plant without device assignment - server-side creation"""
     # Get effective user (handles impersonation)
@@ -199,8 +189,8 @@ async def create_plant_new(
 @router.get("", response_model=List[PlantRead])
 async def list_plants(
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency()),
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db),
     active_only: bool = False
 ):
     """List all plants owned by or shared with the user"""
@@ -291,8 +281,8 @@ async def list_plants(
 async def get_plant(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get a specific plant by ID"""
     # Get effective user (handles impersonation)
@@ -378,8 +368,8 @@ async def get_plant(
 async def delete_plant(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete a plant"""
     # Get effective user (handles impersonation)
@@ -407,8 +397,8 @@ async def delete_plant(
 async def get_plant_assignments(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all device assignments for a plant"""
     # Get effective user (handles impersonation)
@@ -490,8 +480,8 @@ async def assign_device_to_plant(
     request: Request,
     plant_id: str,
     assign_data: DeviceAssignRequest,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Assign a device to a plant"""
     # Get effective user (handles impersonation)
@@ -572,8 +562,8 @@ async def assign_device_to_plant(
 async def unassign_device_from_plant(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Unassign the current device from a plant"""
     # Get effective user (handles impersonation)
@@ -614,8 +604,8 @@ async def change_plant_phase(
     request: Request,
     plant_id: str,
     new_phase: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Change the current phase of a plant"""
     # Get effective user (handles impersonation)
@@ -683,8 +673,8 @@ async def change_plant_phase(
 async def get_phase_history(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get phase history for a plant"""
     # Get effective user (handles impersonation)
@@ -726,8 +716,8 @@ async def get_phase_history(
 async def get_plant_report(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """
     Get the report for a plant.
@@ -758,8 +748,8 @@ async def get_plant_report(
 async def finish_plant(
     request: Request,
     plant_id: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Mark a plant as finished and generate frozen report"""
     # Get effective user (handles impersonation)
@@ -825,8 +815,8 @@ async def update_plant_name(
     request: Request,
     plant_id: str,
     name: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update plant name"""
     # Get effective user (handles impersonation)
@@ -851,8 +841,8 @@ async def update_plant_batch(
     request: Request,
     plant_id: str,
     batch_number: str,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update plant batch number"""
     # Get effective user (handles impersonation)
@@ -882,8 +872,8 @@ async def update_plant_visibility(
     plant_id: str,
     updates: PlantVisibilityUpdate,
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update plant visibility fields"""
     # Get effective user (handles impersonation)
@@ -924,8 +914,8 @@ async def apply_template_to_plant(
     request: Request,
     plant_id: str,
     template_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Apply a phase template to a plant"""
     # Get effective user (handles impersonation)
@@ -971,8 +961,8 @@ async def update_plant_yield(
     request: Request,
     plant_id: str,
     yield_grams: float,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update plant yield"""
     # Get effective user (handles impersonation)
@@ -996,8 +986,8 @@ async def update_plant_yield(
 async def reorder_plants(
     request: Request,
     plant_order: List[str],
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Reorder plants for display"""
     # Get effective user (handles impersonation)
@@ -1025,7 +1015,7 @@ async def create_plant_device(
     device_id: str,
     plant_data: PlantCreate,
     api_key: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a plant from a device using API key"""
     # Verify device and API key
@@ -1065,7 +1055,7 @@ async def finish_plant_device(
     device_id: str,
     plant_id: str,
     api_key: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """Finish a plant from a device using API key and generate frozen report"""
     # Verify device and API key
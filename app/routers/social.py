@@ -23,7 +23,10 @@ from app.schemas.social import (
     ReviewResponseCreate, ReviewResponseUpdate, ReviewResponseRead,
     AdminSettingUpdate, AdminSettingRead
 )
-from app.dependencies import get_current_user_dependency, get_db_dependency, get_optional_user, require_superuser
+from app.auth import current_user as current_user_dep
+from app.database import get_db
+from app.dependencies import get_optional_user, require_superuser_from_claims
+from app.utils.user_cache import CachedUser
 
 router = APIRouter(prefix="/api/social", tags=["social"])
 
@@ -138,8 +141,8 @@ async def _check_anonymous_browsing(session: AsyncSession) -> bool:
 @router.post("/profile", response_model=GrowerProfileRead)
 async def create_or_update_profile(
     profile_data: GrowerProfileUpdate,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create or update current user's grower profile"""
     # Get or create profile
@@ -164,8 +167,8 @@ async def create_or_update_profile(
 
 @router.get("/profile/me", response_model=GrowerProfileRead)
 async def get_my_profile(
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get current user's grower profile"""
     result = await session.execute(
@@ -186,8 +189,8 @@ async def get_my_profile(
 @router.get("/profile/{user_id}", response_model=GrowerProfileRead)
 async def get_grower_profile(
     user_id: int,
-    session: AsyncSession = Depends(get_db_dependency()),
-    current_user: Optional[User] = Depends(get_optional_user)
+    session: AsyncSession = Depends(get_db),
+    current_user: Optional[CachedUser] = Depends(get_optional_user)
 ):
     """Get a grower's public profile (or own profile if authenticated)"""
     result = await session.execute(
@@ -223,8 +226,8 @@ async def browse_growers(
     skip: int = 0,
     limit: int = 20,
     sort_by: str = Query("recent", regex="^(recent|reports)$"),
-    session: AsyncSession = Depends(get_db_dependency()),
-    current_user: Optional[User] = Depends(get_optional_user)
+    session: AsyncSession = Depends(get_db),
+    current_user: Optional[CachedUser] = Depends(get_optional_user)
 ):
     """Browse all public grower profiles (with optional anonymous browsing check)"""
     # Check if anonymous browsing is allowed (if not authenticated)
@@ -280,8 +283,8 @@ async def browse_growers(
 @router.post("/product-locations", response_model=ProductLocationRead)
 async def add_product_location(
     location_data: ProductLocationCreate,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Add product location to current user's profile"""
     location = ProductLocation(
@@ -299,8 +302,8 @@ async def add_product_location(
 async def update_product_location(
     location_id: int,
     location_data: ProductLocationUpdate,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update a product location"""
     result = await session.execute(
@@ -323,8 +326,8 @@ async def update_product_location(
 @router.delete("/product-locations/{location_id}")
 async def remove_product_location(
     location_id: int,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Remove a product location"""
     result = await session.execute(
@@ -343,8 +346,8 @@ async def remove_product_location(
 
 @router.get("/product-locations/me", response_model=List[ProductLocationRead])
 async def get_my_product_locations(
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get current user's product locations"""
     result = await session.execute(
@@ -356,8 +359,8 @@ async def get_my_product_locations(
 @router.get("/product-locations/{user_id}", response_model=List[ProductLocationRead])
 async def get_grower_product_locations(
     user_id: int,
-    session: AsyncSession = Depends(get_db_dependency()),
-    current_user: Optional[User] = Depends(get_optional_user)
+    session: AsyncSession = Depends(get_db),
+    current_user: Optional[CachedUser] = Depends(get_optional_user)
 ):
     """Get a grower's product locations (public or own profile)"""
     # Check if viewing own profile
@@ -384,8 +387,8 @@ async def get_grower_product_locations(
 @router.post("/reports/publish", response_model=PublishedReportRead)
 async def publish_report(
     report_create: PublishedReportCreate,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Publish a completed plant report"""
     # Verify plant belongs to user
@@ -446,8 +449,8 @@ async def publish_report(
 @router.post("/reports/{report_id}/unpublish")
 async def unpublish_report(
     report_id: int,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Unpublish a report (soft delete)"""
     result = await session.execute(
@@ -471,8 +474,8 @@ async def unpublish_report(
 @router.get("/reports/{report_id}", response_model=PublishedReportRead)
 async def get_published_report(
     report_id: int,
-    session: AsyncSession = Depends(get_db_dependency()),
-    current_user: Optional[User] = Depends(get_optional_user)
+    session: AsyncSession = Depends(get_db),
+    current_user: Optional[CachedUser] = Depends(get_optional_user)
 ):
     """Get a published report (public endpoint with anonymous browsing check)"""
     # Check if anonymous browsing is allowed
@@ -509,8 +512,8 @@ async def browse_reports(
     strain: Optional[str] = None,
     grower_id: Optional[int] = None,
     sort_by: str = Query("recent", regex="^(recent|views)$"),
-    session: AsyncSession = Depends(get_db_dependency()),
-    current_user: Optional[User] = Depends(get_optional_user)
+    session: AsyncSession = Depends(get_db),
+    current_user: Optional[CachedUser] = Depends(get_optional_user)
 ):
     """Browse published reports (public with anonymous browsing check)"""
     # Check if anonymous browsing is allowed
@@ -578,8 +581,8 @@ async def browse_reports(
 @router.post("/strains/upcoming", response_model=UpcomingStrainRead)
 async def add_upcoming_strain(
     strain_data: UpcomingStrainCreate,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Add an upcoming strain to current user's profile"""
     strain = UpcomingStrain(
@@ -596,8 +599,8 @@ async def add_upcoming_strain(
 @router.delete("/strains/upcoming/{strain_id}")
 async def remove_upcoming_strain(
     strain_id: int,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Remove an upcoming strain"""
     result = await session.execute(
@@ -617,8 +620,8 @@ async def remove_upcoming_strain(
 @router.get("/strains/upcoming/{user_id}", response_model=List[UpcomingStrainRead])
 async def get_upcoming_strains(
     user_id: int,
-    session: AsyncSession = Depends(get_db_dependency()),
-    current_user: Optional[User] = Depends(get_optional_user)
+    session: AsyncSession = Depends(get_db),
+    current_user: Optional[CachedUser] = Depends(get_optional_user)
 ):
     """Get upcoming strains for a grower (public or own profile)"""
     # Check if viewing own profile
@@ -648,8 +651,8 @@ async def get_upcoming_strains(
 async def submit_review(
     report_id: int,
     review_data: StrainReviewCreate,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Submit or update a review for a strain (published report)"""
     # Verify report exists and is published
@@ -714,8 +717,8 @@ async def submit_review(
 @router.delete("/reviews/{review_id}")
 async def delete_review(
     review_id: int,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete your review"""
     result = await session.execute(
@@ -737,7 +740,7 @@ async def get_reviews(
     report_id: int,
     skip: int = 0,
     limit: int = 20,
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all reviews for a published report"""
     result = await session.execute(
@@ -802,8 +805,8 @@ async def get_reviews(
 async def submit_response(
     review_id: int,
     response_data: ReviewResponseCreate,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Grower responds to a review"""
     # Get review and verify ownership of report
@@ -863,8 +866,8 @@ async def submit_response(
 @router.delete("/reviews/{review_id}/response")
 async def delete_response(
     review_id: int,
-    current_user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user: User = Depends(current_user_dep),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete grower's response to a review"""
     result = await session.execute(
@@ -885,8 +888,8 @@ async def delete_response(
 
 @router.get("/admin/settings", response_model=List[AdminSettingRead])
 async def get_admin_settings(
-    current_user: User = Depends(require_superuser),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user_id: int = Depends(require_superuser_from_claims),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all admin settings (superuser only)"""
     result = await session.execute(select(AdminSetting))
@@ -897,8 +900,8 @@ async def get_admin_settings(
 async def update_admin_setting(
     setting_key: str,
     setting_data: AdminSettingUpdate,
-    current_user: User = Depends(require_superuser),
-    session: AsyncSession = Depends(get_db_dependency())
+    current_user_id: int = Depends(require_superuser_from_claims),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update an admin setting value (superuser only)"""
     result = await session.execute(
@@ -8,24 +8,14 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.auth import current_user
+from app.database import get_db
 from app.models import User, PhaseTemplate
 from app.schemas import PhaseTemplateCreate, PhaseTemplateRead
 
 router = APIRouter(prefix="/user/phase-templates", tags=["templates"])
 
 
-def get_current_user_dependency():
-    """Import and return current_user dependency - imported here to avoid circular imports"""
-    from app.main import current_user
-    return current_user
-
-
-def get_db_dependency():
-    """Import and return get_db dependency - imported here to avoid circular imports"""
-    from app.main import get_db
-    return get_db
-
-
 async def get_effective_user(
     request: Request,
     user: User,
@@ -51,8 +41,8 @@ async def get_effective_user(
 @router.get("", response_model=List[PhaseTemplateRead])
 async def list_phase_templates(
     request: Request,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Get all phase templates for the current user"""
     # Get effective user (handles impersonation)
@@ -70,8 +60,8 @@ async def list_phase_templates(
 @router.post("", response_model=PhaseTemplateRead)
 async def create_phase_template(
     template_data: PhaseTemplateCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Create a new phase template"""
     new_template = PhaseTemplate(
@@ -98,8 +88,8 @@ async def create_phase_template(
 async def update_phase_template(
     template_id: int,
     template_data: PhaseTemplateCreate,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Update a phase template"""
     result = await session.execute(
@@ -132,8 +122,8 @@ async def update_phase_template(
 @router.delete("/{template_id}")
 async def delete_phase_template(
     template_id: int,
-    user: User = Depends(get_current_user_dependency()),
-    session: AsyncSession = Depends(get_db_dependency())
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_db)
 ):
     """Delete a phase template"""
     result = await session.execute(
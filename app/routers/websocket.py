@@ -15,6 +15,8 @@ from sqlalchemy.dialects.mysql import insert
 from starlette.websockets import WebSocketDisconnect
 import jwt
 
+from app.auth import SECRET
+from app.database import async_session_maker, get_db
 from app.models import User, Device, DeviceShare, LocationShare, DeviceFirmwareAssignment, DeviceConnection, Notification, NotificationSeverity, NotificationStatus
 
 router = APIRouter(tags=["websocket"])
@@ -24,24 +26,6 @@ device_connections: Dict[str, WebSocket] = {}
 user_connections: Dict[str, List[WebSocket]] = defaultdict(list)
 
 
-def get_db_dependency():
-    """Import and return get_db dependency"""
-    from app.main import get_db
-    return get_db
-
-
-def get_secret():
-    """Import and return SECRET"""
-    from app.main import SECRET
-    return SECRET
-
-
-def get_async_session_maker():
-    """Import and return async_session_maker"""
-    from app.main import async_session_maker
-    return async_session_maker
-
-
 async def send_to_device(device_id: str, message: dict):
     """
     Send a message to a device via WebSocket if it's connected.
@@ -252,7 +236,7 @@ async def device_websocket(
     websocket: WebSocket,
     device_id: str,
     api_key: str = Query(...),
-    session: AsyncSession = Depends(get_db_dependency())
+    session: AsyncSession = Depends(get_db)
 ):
     device = None  # Track device for cleanup
     device_added_to_connections = False  # Track if we added to device_connections
@@ -672,8 +656,6 @@ async def user_websocket(websocket: WebSocket, device_id: str):
 
     # Get user from cookie
     try:
-        async_session_maker = get_async_session_maker()
-        SECRET = get_secret()
 
         async with async_session_maker() as session:
             # Decode the JWT token directly - ignore audience claim
@@ -0,0 +1,342 @@
+-- app/sql/schema.sql - Tables init_database creates when missing
+-- Most also exist as models (created by create_all first); these DDLs keep the extra
+-- indexes and comments for databases set up before the models.
+-- One statement per table, each ending in ';' on its own line. Edits change
+-- SCHEMA_FINGERPRINT in app/init_database.py, so existing databases pick them up.
+
+CREATE TABLE IF NOT EXISTS device_shares (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    device_id INT NOT NULL,
+    owner_user_id INT NOT NULL,
+    shared_with_user_id INT NULL,
+    share_code VARCHAR(12) NOT NULL UNIQUE,
+    permission_level VARCHAR(20) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    accepted_at DATETIME NULL,
+    revoked_at DATETIME NULL,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    INDEX idx_device_id (device_id),
+    INDEX idx_share_code (share_code),
+    INDEX idx_owner_user_id (owner_user_id),
+    INDEX idx_shared_with_user_id (shared_with_user_id),
+    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE,
+    FOREIGN KEY (owner_user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (shared_with_user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Device-to-device relationships
+CREATE TABLE IF NOT EXISTS device_connections (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    source_device_id INT NOT NULL COMMENT 'Device initiating the connection',
+    target_device_id INT NOT NULL COMMENT 'Device being connected to',
+    connection_type VARCHAR(50) NOT NULL COMMENT 'valve_control, power_monitoring, etc',
+    config JSON NULL COMMENT 'Connection-specific configuration (valve IDs, etc)',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    removed_at DATETIME NULL COMMENT 'Soft delete timestamp',
+    INDEX idx_source_device (source_device_id),
+    INDEX idx_target_device (target_device_id),
+    INDEX idx_connection_type (connection_type),
+    INDEX idx_active (source_device_id, removed_at),
+    FOREIGN KEY (source_device_id) REFERENCES devices(id) ON DELETE CASCADE,
+    FOREIGN KEY (target_device_id) REFERENCES devices(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS locations (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    description TEXT NULL,
+    parent_id INT NULL,
+    user_id INT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_parent_id (parent_id),
+    INDEX idx_user_id (user_id),
+    FOREIGN KEY (parent_id) REFERENCES locations(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS location_shares (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    location_id INT NOT NULL,
+    owner_user_id INT NOT NULL,
+    shared_with_user_id INT NULL,
+    share_code VARCHAR(12) NOT NULL UNIQUE,
+    permission_level VARCHAR(20) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    accepted_at DATETIME NULL,
+    revoked_at DATETIME NULL,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    INDEX idx_location_id (location_id),
+    INDEX idx_share_code (share_code),
+    INDEX idx_owner_user_id (owner_user_id),
+    INDEX idx_shared_with_user_id (shared_with_user_id),
+    FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE CASCADE,
+    FOREIGN KEY (owner_user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (shared_with_user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS plant_reports (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    plant_id INT NOT NULL UNIQUE,
+    generated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    report_version INT NOT NULL DEFAULT 1,
+    plant_name VARCHAR(255) NOT NULL,
+    strain VARCHAR(255) NULL,
+    start_date DATETIME NULL,
+    end_date DATETIME NULL,
+    final_phase VARCHAR(50) NULL,
+    raw_data LONGTEXT NOT NULL COMMENT 'JSON blob with all raw data',
+    aggregated_stats TEXT NULL COMMENT 'JSON blob with aggregated statistics',
+    INDEX idx_plant_id (plant_id),
+    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS plant_daily_logs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    plant_id INT NOT NULL,
+    log_date DATE NOT NULL,
+
+    -- Hydroponic data (min/max/avg for daily aggregation)
+    ph_min FLOAT NULL,
+    ph_max FLOAT NULL,
+    ph_avg FLOAT NULL,
+    ec_min FLOAT NULL,
+    ec_max FLOAT NULL,
+    ec_avg FLOAT NULL,
+    tds_min FLOAT NULL,
+    tds_max FLOAT NULL,
+    tds_avg FLOAT NULL,
+    water_temp_min FLOAT NULL,
+    water_temp_max FLOAT NULL,
+    water_temp_avg FLOAT NULL,
+
+    -- Dosing totals for the day
+    total_ph_up_ml FLOAT NULL DEFAULT 0.0,
+    total_ph_down_ml FLOAT NULL DEFAULT 0.0,
+    dosing_events_count INT NULL DEFAULT 0,
+
+    -- Environmental data (min/max/avg for daily aggregation)
+    co2_min INT NULL,
+    co2_max INT NULL,
+    co2_avg FLOAT NULL,
+    air_temp_min FLOAT NULL,
+    air_temp_max FLOAT NULL,
+    air_temp_avg FLOAT NULL,
+    humidity_min FLOAT NULL,
+    humidity_max FLOAT NULL,
+    humidity_avg FLOAT NULL,
+    vpd_min FLOAT NULL,
+    vpd_max FLOAT NULL,
+    vpd_avg FLOAT NULL,
+
+    -- Light tracking (based on threshold crossings)
+    total_light_seconds INT NULL,
+    light_cycles_count INT NULL,
+    longest_light_period_seconds INT NULL,
+    shortest_light_period_seconds INT NULL,
+
+    -- Metadata
+    hydro_device_id INT NULL,
+    env_device_id INT NULL,
+    last_hydro_reading DATETIME NULL,
+    last_env_reading DATETIME NULL,
+    readings_count INT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    -- Indexes
+    INDEX idx_plant_id (plant_id),
+    INDEX idx_log_date (log_date),
+    INDEX idx_plant_date (plant_id, log_date),
+
+    -- Unique constraint: one row per plant per day
+    UNIQUE KEY uq_plant_date (plant_id, log_date),
+
+    -- Foreign keys
+    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE,
+    FOREIGN KEY (hydro_device_id) REFERENCES devices(id) ON DELETE SET NULL,
+    FOREIGN KEY (env_device_id) REFERENCES devices(id) ON DELETE SET NULL
+) ENGINE=InnoDB COMMENT='Plant-centric daily aggregated sensor logs';
+
+CREATE TABLE IF NOT EXISTS device_posting_slots (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    device_id INT NOT NULL UNIQUE,
+    assigned_minute INT NOT NULL COMMENT 'Minutes from posting window start (0-299 for 5-hour window)',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_device_id (device_id),
+    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
+) ENGINE=InnoDB COMMENT='Device daily posting time slots for load balancing';
+
+CREATE TABLE IF NOT EXISTS dosing_events (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    plant_id INT NOT NULL,
+    device_id INT NOT NULL,
+    event_date DATE NOT NULL COMMENT 'Date for quick daily queries',
+    timestamp DATETIME NOT NULL COMMENT 'Exact time of dosing event',
+    dosing_type VARCHAR(50) NOT NULL COMMENT 'ph_up, ph_down, nutrient_a, nutrient_b, etc.',
+    amount_ml FLOAT NOT NULL COMMENT 'Amount dosed in milliliters',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_plant_id (plant_id),
+    INDEX idx_device_id (device_id),
+    INDEX idx_event_date (event_date),
+    INDEX idx_plant_date (plant_id, event_date),
+    INDEX idx_device_date (device_id, event_date),
+    UNIQUE KEY uq_plant_timestamp_type (plant_id, timestamp, dosing_type),
+    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE,
+    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
+) ENGINE=InnoDB COMMENT='Individual dosing events from hydro controllers';
+
+CREATE TABLE IF NOT EXISTS light_events (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    plant_id INT NOT NULL,
+    device_id INT NOT NULL,
+    event_date DATE NOT NULL COMMENT 'Date for quick daily queries',
+    start_time DATETIME NOT NULL COMMENT 'When lights came ON',
+    end_time DATETIME NOT NULL COMMENT 'When lights went OFF',
+    duration_seconds INT NOT NULL COMMENT 'How long lights were ON',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_plant_id (plant_id),
+    INDEX idx_device_id (device_id),
+    INDEX idx_event_date (event_date),
+    INDEX idx_plant_date (plant_id, event_date),
+    INDEX idx_device_date (device_id, event_date),
+    UNIQUE KEY uq_plant_start_time (plant_id, start_time),
+    FOREIGN KEY (plant_id) REFERENCES plants(id) ON DELETE CASCADE,
+    FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
+) ENGINE=InnoDB COMMENT='Individual light ON/OFF events from environment sensors';
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    device_id VARCHAR(100) NOT NULL COMMENT 'Device identifier (matches devices.device_id)',
+    alert_type VARCHAR(100) NOT NULL COMMENT 'Alert type string (e.g., PH_OUT_OF_RANGE)',
+    alert_type_id INT NOT NULL COMMENT 'Numeric alert type ID from device enum',
+    severity ENUM('INFO', 'WARNING', 'CRITICAL') NOT NULL,
+    status ENUM('ACTIVE', 'SELF_CLEARED', 'USER_CLEARED') NOT NULL DEFAULT 'ACTIVE',
+    source VARCHAR(200) NOT NULL COMMENT 'Source component (e.g., pH Probe, EC Probe)',
+    message TEXT NOT NULL COMMENT 'Detailed alert message',
+    first_occurrence BIGINT UNSIGNED NOT NULL COMMENT 'Timestamp (millis) when first occurred',
+    last_occurrence BIGINT UNSIGNED NULL COMMENT 'Timestamp (millis) when last reported',
+    cleared_at BIGINT UNSIGNED NULL COMMENT 'Timestamp (millis) when cleared',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_device_alert (device_id, alert_type),
+    INDEX idx_status_cleared (status, cleared_at),
+    INDEX idx_device_status_severity (device_id, status, severity),
+    INDEX idx_created_at (created_at)
+) ENGINE=InnoDB COMMENT='Device notifications and alerts';
+
+CREATE TABLE IF NOT EXISTS login_history (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    login_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ip_address VARCHAR(45) NULL COMMENT 'Client IP address (IPv6 max length is 45)',
+    user_agent VARCHAR(500) NULL COMMENT 'Client user agent string',
+    INDEX idx_user_id (user_id),
+    INDEX idx_login_at (login_at),
+    INDEX idx_user_login (user_id, login_at),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB COMMENT='User login history (max 10 records per user)';
+
+CREATE TABLE IF NOT EXISTS grower_profiles (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL UNIQUE,
+    business_name VARCHAR(255),
+    bio TEXT,
+    location VARCHAR(255),
+    website VARCHAR(500),
+    instagram VARCHAR(100),
+    is_public BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_public (is_public),
+    INDEX idx_business_name (business_name)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS product_locations (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    store_name VARCHAR(255) NOT NULL,
+    store_link VARCHAR(500),
+    store_phone VARCHAR(20),
+    store_email VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_user (user_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS published_reports (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    plant_id VARCHAR(36) NOT NULL,
+    plant_name VARCHAR(255) NOT NULL,
+    strain VARCHAR(255),
+    start_date DATE,
+    end_date DATE,
+    final_phase VARCHAR(50),
+    report_data JSON NOT NULL,
+    published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    unpublished_at TIMESTAMP NULL,
+    views_count INT DEFAULT 0,
+    grower_notes TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_user (user_id),
+    INDEX idx_published_at (published_at),
+    INDEX idx_strain (strain),
+    INDEX idx_views (views_count),
+    INDEX idx_unpublished (unpublished_at)
+) ENGINE=InnoDB PAGE_COMPRESSED=1;
+
+CREATE TABLE IF NOT EXISTS upcoming_strains (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    strain_name VARCHAR(255) NOT NULL,
+    description TEXT,
+    expected_start_date DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_user (user_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS strain_reviews (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    published_report_id INT NOT NULL,
+    reviewer_id INT NOT NULL,
+    rating INT NOT NULL CHECK (rating >= 1 AND rating <= 5),
+    comment TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (published_report_id) REFERENCES published_reports(id) ON DELETE CASCADE,
+    FOREIGN KEY (reviewer_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE KEY unique_review (published_report_id, reviewer_id),
+    INDEX idx_report (published_report_id),
+    INDEX idx_reviewer (reviewer_id),
+    INDEX idx_rating (rating)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS review_responses (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    review_id INT NOT NULL,
+    grower_id INT NOT NULL,
+    response_text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (review_id) REFERENCES strain_reviews(id) ON DELETE CASCADE,
+    FOREIGN KEY (grower_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE KEY unique_response (review_id),
+    INDEX idx_review (review_id),
+    INDEX idx_grower (grower_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS admin_settings (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    setting_key VARCHAR(100) NOT NULL UNIQUE,
+    setting_value TEXT,
+    description TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_key (setting_key)
+) ENGINE=InnoDB;
@@ -3,5 +3,6 @@
 Utility functions for the plants logs server.
 """
 from .login_tracker import record_login
+from .user_cache import CachedUser, get_user_cached, invalidate_user
 
-__all__ = ["record_login"]
+__all__ = ["record_login", "CachedUser", "get_user_cached", "invalidate_user"]
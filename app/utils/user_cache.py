@@ -0,0 +1,72 @@
+# app/utils/user_cache.py
+"""
+Short-lived in-process cache of the user fields read on the auth path.
+"""
+import time
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import User
+
+_USER_CACHE_MAXSIZE = 8192
+_USER_CACHE_TTL = 30  # seconds
+
+# Format: {user_id: (CachedUser, cached_at)}
+_user_cache: dict = {}
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Detached snapshot of a user row (no session, no relationships)."""
+    id: int
+    email: str
+    is_active: bool
+    is_superuser: bool
+    is_suspended: bool
+
+
+# Only the columns the auth path reads; avoids materialising a full User entity
+_USER_COLUMNS = (User.id, User.email, User.is_active, User.is_superuser, User.is_suspended)
+
+
+async def get_user_cached(session: AsyncSession, user_id: int) -> Optional[CachedUser]:
+    """
+    Get a user snapshot by ID, hitting the database only on a cache miss.
+
+    Args:
+        session: Database session (used only on a miss)
+        user_id: User ID
+
+    Returns:
+        CachedUser snapshot, or None if the user does not exist
+    """
+    entry = _user_cache.get(user_id)
+    if entry is not None:
+        cached, cached_at = entry
+        if time.monotonic() - cached_at <= _USER_CACHE_TTL:
+            return cached
+        _user_cache.pop(user_id, None)
+
+    result = await session.execute(select(*_USER_COLUMNS).where(User.id == user_id))
+    row = result.first()
+    if row is None:
+        return None
+
+    if len(_user_cache) >= _USER_CACHE_MAXSIZE:
+        _user_cache.pop(next(iter(_user_cache)))
+
+    cached = CachedUser(
+        id=row.id,
+        email=row.email,
+        is_active=bool(row.is_active),
+        is_superuser=bool(row.is_superuser),
+        is_suspended=bool(row.is_suspended),
+    )
+    _user_cache[user_id] = (cached, time.monotonic())
+    return cached
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user's cached snapshot. Call after any change to the user row."""
+    _user_cache.pop(user_id, None)
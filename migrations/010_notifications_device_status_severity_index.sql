@@ -0,0 +1,11 @@
+-- Migration 010: Compound notifications index for the per-device severity counts
+-- The notification list and summary filter on device_id IN (...), status and
+-- severity. (device_id, status, severity) serves those counts from the index
+-- and still covers every (device_id, status) lookup, so idx_device_status is
+-- replaced. idx_severity (three distinct values) is dropped; the optimizer
+-- doesn't pick it over the device-based indexes.
+
+ALTER TABLE notifications
+    ADD INDEX IF NOT EXISTS idx_device_status_severity (device_id, status, severity),
+    DROP INDEX IF EXISTS idx_device_status,
+    DROP INDEX IF EXISTS idx_severity;
@@ -0,0 +1,70 @@
+"""
+Migration 010: Compound notifications index
+- Adds idx_device_status_severity on notifications(device_id, status, severity)
+- Drops idx_device_status and idx_severity
+"""
+
+import mysql.connector
+from mysql.connector import Error
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def run_migration():
+    connection = None
+    try:
+        # Get database connection details from environment
+        db_config = {
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'user': os.getenv('DB_USER'),
+            'password': os.getenv('DB_PASSWORD'),
+            'database': os.getenv('DB_NAME')
+        }
+
+        print(f"Connecting to database: {db_config['host']}/{db_config['database']}")
+        connection = mysql.connector.connect(**db_config)
+
+        if connection.is_connected():
+            cursor = connection.cursor()
+            print("✓ Connected to MySQL database")
+
+            # Read and execute migration SQL file
+            print("\nReading migration SQL file...")
+            with open('migrations/010_notifications_device_status_severity_index.sql', 'r') as f:
+                sql_script = f.read()
+
+            print("\nExecuting migration SQL...")
+            # Drop comment lines, then split by semicolon and execute each statement
+            sql_script = "\n".join(
+                line for line in sql_script.splitlines() if not line.strip().startswith('--')
+            )
+            statements = sql_script.split(';')
+            for statement in statements:
+                statement = statement.strip()
+                if statement and not statement.startswith('--'):
+                    cursor.execute(statement)
+
+            connection.commit()
+            print("\n✓ Migration 010 completed successfully!")
+            print("\nChanges made:")
+            print("- Created idx_device_status_severity index")
+            print("- Dropped idx_device_status and idx_severity indexes")
+
+    except Error as e:
+        print(f"\n✗ Migration failed: {e}")
+        if connection:
+            connection.rollback()
+        raise
+
+    finally:
+        if connection and connection.is_connected():
+            cursor.close()
+            connection.close()
+            print("\nDatabase connection closed")
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Migration 010: Compound notifications index")
+    print("=" * 60)
+    run_migration()
@@ -20,7 +20,7 @@ from sqlalchemy.orm import declarative_base
 # Load database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL:
-    DATABASE_URL = DATABASE_URL.replace("mariadb+mariadbconnector", "mariadb+aiomysql")
+    DATABASE_URL = DATABASE_URL.replace("mariadb+mariadbconnector", "mariadb+asyncmy")
 
 Base = declarative_base()
 
@@ -21,7 +21,7 @@ from sqlalchemy.orm import declarative_base, relationship
 # Load database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL:
-    DATABASE_URL = DATABASE_URL.replace("mariadb+mariadbconnector", "mariadb+aiomysql")
+    DATABASE_URL = DATABASE_URL.replace("mariadb+mariadbconnector", "mariadb+asyncmy")
 
 # Define models directly to avoid importing main.py which initializes the FastAPI app
 Base = declarative_base()